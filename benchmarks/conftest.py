@@ -0,0 +1,112 @@
+"""
+Fixtures compartidas de la suite de benchmarks.
+
+Todo corre offline: la API de Spotify la sirve `FakeSpotifyServer` y los
+CSV, carpetas de librería y archivos de audio se generan en tmp.
+
+    python -m pytest benchmarks --benchmark-autosave
+    python -m pytest benchmarks --benchmark-compare
+
+Los resultados se guardan como JSON en `.benchmarks/` para comparar versiones.
+"""
+
+import csv
+import sys
+import struct
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from fake_spotify import FakeSpotifyServer
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("cantares-bench")
+    group.addoption("--spotify-playlists", type=int, default=10,
+                    help="Playlists servidas por el fake de Spotify")
+    group.addoption("--spotify-tracks", type=int, default=200,
+                    help="Tracks por playlist en el fake de Spotify")
+    group.addoption("--spotify-liked", type=int, default=500,
+                    help="Liked Songs servidas por el fake de Spotify")
+    group.addoption("--spotify-latency-ms", type=float, default=0.0,
+                    help="Latencia artificial por request del fake de Spotify")
+    group.addoption("--fixture-tracks", type=int, default=5000,
+                    help="Filas del CSV / archivos de librería generados")
+
+
+@pytest.fixture(scope="session")
+def bench_size(request):
+    return request.config.getoption("--fixture-tracks")
+
+
+@pytest.fixture(scope="session")
+def spotify_server(request):
+    opt = request.config.getoption
+    server = FakeSpotifyServer(
+        playlists=opt("--spotify-playlists"),
+        tracks_per_playlist=opt("--spotify-tracks"),
+        liked=opt("--spotify-liked"),
+        latency_ms=opt("--spotify-latency-ms"),
+    ).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def export_csv(tmp_path_factory, bench_size):
+    """CSV con el formato de spotify_export.csv repartido en 20 playlists."""
+    path = tmp_path_factory.mktemp("csv") / "spotify_export.csv"
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Track Name", "Artist Name", "Album Name", "Playlist", "URI"])
+        for i in range(bench_size):
+            writer.writerow([f"Track {i}", f"Artist {i % 97}", f"Album {i % 31}",
+                             f"Playlist {i % 20}", f"spotify:track:{i:022d}"])
+    return path
+
+
+@pytest.fixture(scope="session")
+def library_dir(tmp_path_factory, bench_size):
+    """Carpeta de librería con `Artist - Title.mp3` vacíos."""
+    root = tmp_path_factory.mktemp("library")
+    for i in range(bench_size):
+        (root / f"Artist {i % 97} - Track {i}.mp3").touch()
+    return root
+
+
+def _flac_bytes() -> bytes:
+    """FLAC mínimo válido para mutagen: marker + STREAMINFO, sin frames."""
+    sample_rate, channels, bps, total = 44100, 2, 16, 44100 * 180
+    info = struct.pack(">HH", 4096, 4096) + b"\x00" * 6
+    packed = (sample_rate << 44) | ((channels - 1) << 41) | ((bps - 1) << 36) | total
+    info += packed.to_bytes(8, "big") + b"\x00" * 16
+    header = bytes([0x80]) + len(info).to_bytes(3, "big")
+    return b"fLaC" + header + info
+
+
+@pytest.fixture
+def audio_files(tmp_path):
+    """Un FLAC y un MP3 recién generados por cada ronda de tagging."""
+    flac = tmp_path / "bench.flac"
+    flac.write_bytes(_flac_bytes())
+    mp3 = tmp_path / "bench.mp3"
+    # Frame header MPEG-1 Layer III 128kbps 44.1kHz + payload nulo
+    mp3.write_bytes((b"\xff\xfb\x90\x00" + b"\x00" * 413) * 64)
+    return flac, mp3
+
+
+@pytest.fixture
+def track_info():
+    return {
+        "SNG_TITLE": "Asi Es La Vida",
+        "ART_NAME": "Elefante",
+        "ALB_TITLE": "Lo Que Andabas Buscando",
+        "TRACK_NUMBER": 3,
+        "PHYSICAL_RELEASE_DATE": "2000-01-01",
+        "ISRC": "MXF010000123",
+    }
@@ -0,0 +1,137 @@
+"""
+fake_spotify.py — Stand-in local de la Web API de Spotify para benchmarks.
+
+Sirve solo los endpoints de paginado que usan los exportadores
+(me/, me/playlists, playlists/{id}/tracks|items, me/tracks) con datos
+deterministas, tamaños configurables y latencia artificial por request.
+Un cliente `spotipy.Spotify` apuntado a `server.prefix` lo consume sin
+tocar la red ni OAuth.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+class FakeSpotifyServer:
+    """Servidor HTTP local que imita el paginado de la API de Spotify."""
+
+    def __init__(self, playlists: int = 10, tracks_per_playlist: int = 200,
+                 liked: int = 500, latency_ms: float = 0.0):
+        self.playlists = playlists
+        self.tracks_per_playlist = tracks_per_playlist
+        self.liked = liked
+        self.latency = latency_ms / 1000.0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def prefix(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1/"
+
+    @property
+    def total_tracks(self) -> int:
+        return self.playlists * self.tracks_per_playlist + self.liked
+
+    def start(self) -> "FakeSpotifyServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def client(self):
+        """Cliente spotipy apuntado al servidor local (sin OAuth, sin reintentos)."""
+        import spotipy
+        sp = spotipy.Spotify(auth="fake-token", retries=0, status_retries=0)
+        sp.prefix = self.prefix
+        return sp
+
+    # ----------------------------------------------------------
+    #  Datos deterministas
+    # ----------------------------------------------------------
+
+    @staticmethod
+    def _track(idx: int) -> dict:
+        return {
+            "track": {
+                "name": f"Track {idx}",
+                "artists": [{"name": f"Artist {idx % 97}"}],
+                "album": {"name": f"Album {idx % 31}"},
+                "uri": f"spotify:track:{idx:022d}",
+            }
+        }
+
+    def _playlist(self, idx: int) -> dict:
+        return {
+            "id": f"pl{idx}",
+            "name": f"Playlist {idx}",
+            "tracks": {"total": self.tracks_per_playlist},
+        }
+
+    def _page(self, path: str, query: dict, total: int, make_item, offset_base: int = 0) -> dict:
+        limit = int(query.get("limit", ["20"])[0])
+        offset = int(query.get("offset", ["0"])[0])
+        end = min(offset + limit, total)
+        items = [make_item(offset_base + i) for i in range(offset, end)]
+        nxt = None
+        if end < total:
+            nxt = f"{self.prefix}{path}?offset={end}&limit={limit}"
+        return {"items": items, "total": total, "limit": limit, "offset": offset,
+                "next": nxt, "previous": None}
+
+    # ----------------------------------------------------------
+    #  Routing
+    # ----------------------------------------------------------
+
+    def _handle(self, req: BaseHTTPRequestHandler):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        url = urlparse(req.path)
+        path = url.path[len("/v1/"):].rstrip("/") if url.path.startswith("/v1/") else ""
+        query = parse_qs(url.query)
+
+        if path == "me":
+            body = {"id": "bench", "display_name": "Bench User"}
+        elif path == "me/playlists":
+            body = self._page(path, query, self.playlists, self._playlist)
+        elif path == "me/tracks":
+            body = self._page(path, query, self.liked, self._track, offset_base=10**9)
+        elif path.startswith("playlists/") and path.endswith(("/tracks", "/items")):
+            pl_idx = int(path.split("/")[1][2:])
+            body = self._page(path, query, self.tracks_per_playlist, self._track,
+                              offset_base=pl_idx * self.tracks_per_playlist)
+        else:
+            req.send_response(404)
+            req.end_headers()
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        req.send_response(200)
+        req.send_header("Content-Type", "application/json")
+        req.send_header("Content-Length", str(len(payload)))
+        req.end_headers()
+        req.wfile.write(payload)
@@ -0,0 +1,38 @@
+"""Benchmarks del motor de exportación contra el fake local de Spotify."""
+
+from cantares.core.spotify_exporter import SpotifyExporter
+from cantares.core import spotify as core_spotify
+
+
+def test_export_to_csv(benchmark, spotify_server, tmp_path):
+    exporter = SpotifyExporter(update_callback=lambda msg: None)
+    exporter.sp = spotify_server.client()
+    out = tmp_path / "spotify_export.csv"
+
+    total = benchmark(exporter.export_to_csv, str(out))
+
+    assert total == spotify_server.total_tracks
+    benchmark.extra_info["tracks"] = total
+    benchmark.extra_info["latency_ms"] = spotify_server.latency * 1000
+
+
+def test_export_selected_playlists(benchmark, spotify_server, tmp_path):
+    exporter = core_spotify.SpotifyExporter()
+    exporter.sp = spotify_server.client()
+    playlists = exporter.get_playlists()
+    out = tmp_path / "spotify_export.csv"
+
+    benchmark(exporter.export_to_csv, playlists, include_liked=True, filename=str(out))
+
+    with open(out, encoding="utf-8") as f:
+        rows = sum(1 for _ in f) - 1
+    assert rows == spotify_server.total_tracks
+
+
+def test_get_liked_songs(benchmark, spotify_server):
+    exporter = core_spotify.SpotifyExporter()
+    exporter.sp = spotify_server.client()
+
+    liked = benchmark(exporter.get_liked_songs)
+
+    assert len(liked) == spotify_server.liked
@@ -0,0 +1,47 @@
+"""Benchmarks de escaneo de librería y escritura de tags."""
+
+from cantares.core.music_downloader import MusicDownloader, DownloadStatus
+from cantares.core.deezer_engine import DeezerEngine
+
+
+def test_skip_existing_tracks(benchmark, library_dir, bench_size, tmp_path):
+    """Chequeo de 'ya existe' que hace download_single antes de descargar."""
+    dl = MusicDownloader(download_dir=str(tmp_path), callback=lambda *a: None, use_deezer=False)
+    tracks = [(f"Artist {i % 97}", f"Track {i}") for i in range(min(1000, bench_size))]
+
+    def scan():
+        return [dl.download_single(artist, title, output_dir=str(library_dir)).status
+                for artist, title in tracks]
+
+    statuses = benchmark(scan)
+
+    assert all(s == DownloadStatus.SKIPPED for s in statuses)
+
+
+def test_find_downloaded_file_fuzzy(benchmark, library_dir, tmp_path):
+    """Peor caso de _find_downloaded_file: sin match exacto, recorre la carpeta."""
+    dl = MusicDownloader(download_dir=str(tmp_path), callback=lambda *a: None, use_deezer=False)
+
+    found = benchmark(dl._find_downloaded_file, str(library_dir), "Artist 5", "Track 5 (Remastered)")
+
+    assert found is not None
+
+
+def test_tag_flac(benchmark, audio_files, track_info, tmp_path):
+    flac, _ = audio_files
+    engine = DeezerEngine(output_dir=str(tmp_path))
+
+    benchmark(engine._tag_file, flac, track_info)
+
+    from mutagen.flac import FLAC
+    assert FLAC(str(flac))["title"] == [track_info["SNG_TITLE"]]
+
+
+def test_tag_mp3(benchmark, audio_files, track_info, tmp_path):
+    _, mp3 = audio_files
+    engine = DeezerEngine(output_dir=str(tmp_path))
+
+    benchmark(engine._tag_file, mp3, track_info)
+
+    from mutagen.id3 import ID3
+    assert str(ID3(str(mp3))["TIT2"]) == track_info["SNG_TITLE"]
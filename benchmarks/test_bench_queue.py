@@ -0,0 +1,41 @@
+"""Benchmarks del parseo de CSV y armado de la cola de descarga."""
+
+from cantares.core.music_downloader import MusicDownloader, BatchResult, csv_playlists
+
+
+def test_download_from_csv_queue(benchmark, export_csv, bench_size, tmp_path):
+    dl = MusicDownloader(download_dir=str(tmp_path), callback=lambda *a: None, use_deezer=False)
+    batches = []
+
+    def fake_batch(tracks, playlist_name="Downloads", callback=None):
+        batches.append(len(tracks))
+        return BatchResult(total=len(tracks), skipped=len(tracks))
+
+    dl.download_batch = fake_batch
+
+    def run():
+        batches.clear()
+        return dl.download_from_csv(str(export_csv))
+
+    result = benchmark(run)
+
+    assert result.total == bench_size
+    assert sum(batches) == bench_size
+
+
+def test_download_from_csv_filtered_range(benchmark, export_csv, tmp_path):
+    dl = MusicDownloader(download_dir=str(tmp_path), callback=lambda *a: None, use_deezer=False)
+    dl.download_batch = lambda tracks, playlist_name="Downloads", callback=None: BatchResult(total=len(tracks))
+
+    result = benchmark(dl.download_from_csv, str(export_csv),
+                       selected_playlists=["Playlist 1", "Playlist 2"],
+                       range_config={"offset": 10, "limit": 100})
+
+    assert result.total <= 100
+
+
+def test_load_csv_playlists(benchmark, export_csv, bench_size):
+    """Escaneo de playlists que hace BatchScreen.load_csv_playlists."""
+    playlists = benchmark(csv_playlists, str(export_csv))
+
+    assert len(playlists) == min(20, bench_size)
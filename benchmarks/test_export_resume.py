@@ -0,0 +1,105 @@
+"""Reanudación de exports contra el fake local de Spotify (sin benchmark)."""
+
+import csv
+import os
+
+import pytest
+
+from fake_spotify import FakeSpotifyServer
+from cantares.core.spotify_exporter import SpotifyExporter
+from cantares.core import spotify as core_spotify
+
+
+class Crash(Exception):
+    pass
+
+
+@pytest.fixture(scope="module")
+def small_server():
+    # Páginas de 100 (playlists) y 50 (liked): 230 y 120 obligan a varias páginas
+    server = FakeSpotifyServer(playlists=3, tracks_per_playlist=230, liked=120).start()
+    yield server
+    server.stop()
+
+
+def crash_mid_page(exporter, on_call):
+    """Que la página número `on_call` escriba la mitad de sus filas y reviente."""
+    original = exporter._write_items
+    calls = {"n": 0}
+
+    def write_items(writer, items, playlist_name):
+        calls["n"] += 1
+        if calls["n"] == on_call:
+            original(writer, items[:len(items) // 2], playlist_name)
+            raise Crash("token expired")
+        return original(writer, items, playlist_name)
+
+    exporter._write_items = write_items
+    return lambda: setattr(exporter, "_write_items", original)
+
+
+def read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [(row["Playlist"], row["URI"]) for row in csv.DictReader(f)]
+
+
+def assert_published(out, expected):
+    rows = read_rows(out)
+    assert len(rows) == expected
+    assert len(set(rows)) == expected
+    assert not os.path.exists(f"{out}.part")
+    assert not os.path.exists(f"{out}.checkpoint.json")
+
+
+@pytest.mark.parametrize("crash_on", [2, 4, 8])
+def test_resume_after_crash(small_server, tmp_path, crash_on):
+    """crash_on 2/4 cae dentro de una playlist; 8 cae en Liked Songs."""
+    exporter = SpotifyExporter(update_callback=lambda msg: None)
+    exporter.sp = small_server.client()
+    out = tmp_path / "spotify_export.csv"
+
+    restore = crash_mid_page(exporter, crash_on)
+    with pytest.raises(Crash):
+        exporter.export_to_csv(str(out))
+    restore()
+    assert not out.exists()
+    assert os.path.exists(f"{out}.checkpoint.json")
+
+    total = exporter.export_to_csv(str(out))
+
+    assert total == small_server.total_tracks
+    assert_published(out, small_server.total_tracks)
+
+
+def test_resume_selected_playlists(small_server, tmp_path):
+    exporter = core_spotify.SpotifyExporter()
+    exporter.sp = small_server.client()
+    playlists = exporter.get_playlists()
+    out = tmp_path / "spotify_export.csv"
+
+    restore = crash_mid_page(exporter, 5)
+    with pytest.raises(Crash):
+        exporter.export_to_csv(playlists, include_liked=True, filename=str(out))
+    restore()
+
+    exporter.export_to_csv(playlists, include_liked=True, filename=str(out))
+
+    assert_published(out, small_server.total_tracks)
+
+
+def test_fingerprint_mismatch_starts_fresh(small_server, tmp_path):
+    """Un checkpoint de otra selección de playlists no se reanuda."""
+    exporter = core_spotify.SpotifyExporter()
+    exporter.sp = small_server.client()
+    playlists = exporter.get_playlists()
+    out = tmp_path / "spotify_export.csv"
+
+    restore = crash_mid_page(exporter, 2)
+    with pytest.raises(Crash):
+        exporter.export_to_csv(playlists, include_liked=True, filename=str(out))
+    restore()
+
+    exporter.export_to_csv(playlists[:1], include_liked=False, filename=str(out))
+
+    assert_published(out, small_server.tracks_per_playlist)
+    assert {playlist for playlist, _ in read_rows(out)} == {playlists[0]["name"]}
@@ -6,6 +6,18 @@ import io
 if sys.platform == "win32":
     sys.stdout.reconfigure(encoding='utf-8')
 
+class DefaultGroup(click.Group):
+    """Group that falls back to a default subcommand (`cantares books "Clean Code"`)."""
+
+    def __init__(self, *args, default_cmd=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.default_cmd = default_cmd
+
+    def parse_args(self, ctx, args):
+        if args and self.default_cmd and args[0] not in self.commands and args[0] not in ctx.help_option_names:
+            args.insert(0, self.default_cmd)
+        return super().parse_args(ctx, args)
+
 @click.group()
 def main():
     """Cantares CLI - Porque lo bueno siempre se comparte"""
@@ -79,10 +91,21 @@ def music(query):
     downloader = MusicDownloader()
     downloader.download(video['url'], metadata)
 
-@main.command()
+@main.group(cls=DefaultGroup, default_cmd="search")
+def books():
+    """Search and download books, or browse the local shelf."""
+    pass
+
+@books.command("search")
 @click.argument("query")
-def books(query):
+@click.option("--local", is_flag=True, help="Full-text search inside the books already in Books/.")
+@click.option("--workers", type=int, default=None, help="Text extraction processes for --local (default: CPU count).")
+@click.option("--limit", type=int, default=10, show_default=True, help="Max results for --local.")
+def books_search(query, local, workers, limit):
     """Search and download books from Anna's Archive."""
+    if local:
+        return _search_local_books(query, workers, limit)
+
     from .books.annas_archive import AnnasArchiveSearcher
     from .books.downloader import BookDownloader
 
@@ -115,6 +138,94 @@ def books(query):
         else:
             click.echo("❌ Could not resolve download link.")
 
+def _search_local_books(query, workers, limit):
+    from .books.fulltext import FullTextIndex
+
+    index = FullTextIndex()
+    stats = index.refresh(workers=workers)
+    if stats["indexed"] or stats["removed"]:
+        click.echo(f"📚 Indexed {stats['indexed']} books ({stats['removed']} removed).")
+    if stats["indexed"] and stats["errors"]:
+        click.echo(f"⚠️ Could not read the text of {stats['errors']} books.")
+
+    results = index.search(query, limit=limit)
+    if not results:
+        click.echo("❌ Nothing inside your local books matches that.")
+        return
+
+    for i, r in enumerate(results):
+        click.echo(f"{i+1}. {r['title']} - {r['author']} ({r['extension']})")
+        click.echo(f"   …{r['snippet']}…")
+        click.echo(f"   {r['path']}")
+
+@books.command("shelf")
+@click.argument("query", required=False, default="")
+@click.option("--workers", type=int, default=None, help="Metadata extraction processes (default: CPU count).")
+@click.option("--limit", type=int, default=50, show_default=True)
+def books_shelf(query, workers, limit):
+    """List or search the books already downloaded to Books/."""
+    from .books.catalog import BookCatalog
+
+    catalog = BookCatalog()
+    stats = catalog.refresh(workers=workers)
+    if stats["added"] or stats["updated"] or stats["removed"]:
+        click.echo(f"📚 Catalog updated: +{stats['added']} ~{stats['updated']} -{stats['removed']}")
+
+    results = catalog.search(query, limit=limit)
+    if not results:
+        click.echo("❌ No books on the local shelf match that.")
+        return
+
+    for r in results:
+        pages = f", {r['pages']} pp." if r['pages'] else ""
+        isbn = f" ISBN {r['isbn']}" if r['isbn'] else ""
+        click.echo(f"• {r['title']} - {r['author']} ({r['year'] or '?'}, {r['extension']}{pages}){isbn}")
+        click.echo(f"  {r['path']}")
+
+@main.group()
+def library():
+    """Tools for the local music library."""
+    pass
+
+@library.command("audit")
+@click.argument("path", default="Downloads", type=click.Path(exists=True, file_okay=False))
+@click.option("--workers", type=int, default=None, help="Analysis processes (default: CPU count).")
+@click.option("--window", type=float, default=10.0, show_default=True, help="Seconds decoded per file.")
+@click.option("--min-cutoff", type=float, default=21000.0, show_default=True,
+              help="Cutoff (Hz) below which a sharp lowpass is flagged as suspect.")
+@click.option("--force", is_flag=True, help="Ignore cached results and re-analyze every file.")
+@click.option("--show-all", is_flag=True, help="List every file, not only the suspects.")
+def library_audit(path, workers, window, min_cutoff, force, show_all):
+    """Flag lossless files that look like upsampled lossy sources."""
+    from .library.audit import AuditSettings, audit_library
+
+    settings = AuditSettings(window_sec=window, min_cutoff_hz=min_cutoff)
+    click.echo(f"🔬 Auditing lossless files in {path}...")
+    try:
+        results = audit_library(
+            path, workers=workers, settings=settings, force=force,
+            callback=lambda current, total, msg: click.echo(f"  [{current}/{total}] {msg}")
+        )
+    except ImportError:
+        click.echo("❌ NumPy is required for the audit. Try: pip install cantares[audit]")
+        return
+    except RuntimeError as e:
+        click.echo(f"❌ {e}")
+        return
+
+    suspects = [r for r in results if r.suspect]
+    errors = [r for r in results if r.status == "error"]
+    cached = sum(1 for r in results if r.cached)
+
+    for r in (results if show_all else suspects + errors):
+        cutoff = f"{r.cutoff_hz / 1000:.1f} kHz" if r.cutoff_hz else "-"
+        icon = {"suspect": "⚠️ ", "error": "❌", "silent": "🔇"}.get(r.status, "✅")
+        detail = r.record.error if r.status == "error" else f"cutoff {cutoff}"
+        click.echo(f"{icon} {r.status.upper():8} {detail:>20}  {r.path}")
+
+    click.echo(f"\n{len(results)} files, {len(suspects)} suspect, {len(errors)} errors "
+               f"({cached} from cache).")
+
 @main.command()
 def tui():
     """Launch the Terminal User Interface."""
@@ -1,2 +1,4 @@
 from .annas_archive import AnnasArchiveSearcher
 from .downloader import BookDownloader
+from .catalog import BookCatalog
+from .fulltext import FullTextIndex
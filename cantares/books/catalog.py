@@ -0,0 +1,324 @@
+import os
+import re
+import sqlite3
+import zipfile
+import threading
+import multiprocessing
+import posixpath
+import xml.etree.ElementTree as ET
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from cantares.core.metrics import Metrics
+
+BOOK_EXTENSIONS = (".epub", ".pdf")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS books (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    extension TEXT,
+    title TEXT,
+    author TEXT,
+    year TEXT,
+    isbn TEXT,
+    pages INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS books_title ON books(title COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS books_author ON books(author COLLATE NOCASE);
+"""
+
+_ISBN_RE = re.compile(r"(97[89][\d\- ]{10,14}\d|\b\d[\d\- ]{8,11}[\dXx]\b)")
+_YEAR_RE = re.compile(r"(1[5-9]\d\d|20\d\d)")
+
+_NS = {
+    "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+    "dc": "http://purl.org/dc/elements/1.1/",
+}
+
+
+class BookCatalog:
+    """
+    Local catalog of the books in `Books/`.
+
+    Metadata (title, author, year, ISBN, page count) is extracted from the
+    EPUB OPF package or the PDF info dictionary in a process pool and kept
+    in SQLite. `refresh()` only re-reads files whose mtime or size changed,
+    so searching the local shelf stays instant.
+    """
+
+    def __init__(self, books_dir: str = "Books", db_path: str = None, metrics=None):
+        self.books_dir = books_dir
+        self.db_path = db_path or os.path.join(books_dir, ".catalog.sqlite3")
+        self.metrics = metrics or Metrics.from_env("books")
+        os.makedirs(books_dir, exist_ok=True)
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def refresh(self, workers: int = None) -> dict:
+        """
+        Incrementally sync the catalog with the files on disk.
+
+        Args:
+            workers: Size of the extraction process pool (default: CPU count).
+
+        Returns:
+            Dict with 'added', 'updated', 'removed' and 'unchanged' counts.
+        """
+        with self.metrics.stage("catalog_scan") as stage:
+            on_disk = {}
+            for root, _, files in os.walk(self.books_dir):
+                for name in files:
+                    if name.lower().endswith(BOOK_EXTENSIONS):
+                        path = os.path.abspath(os.path.join(root, name))
+                        st = os.stat(path)
+                        on_disk[path] = (st.st_mtime, st.st_size)
+
+            with self._connect() as db:
+                known = {row[0]: (row[1], row[2]) for row in
+                         db.execute("SELECT path, mtime, size FROM books")}
+
+            changed = [p for p, sig in on_disk.items() if known.get(p) != sig]
+            removed = [p for p in known if p not in on_disk]
+            stage.add("cache_hits", len(on_disk) - len(changed))
+
+            with self.metrics.stage("catalog_extract") as extract_stage:
+                records = _map_parallel(extract_metadata, changed, workers)
+                extract_stage.add("files", len(records))
+                extract_stage.add("bytes", sum(on_disk[p][1] for p in changed))
+
+            with self._connect() as db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO books (path, mtime, size, extension, title, author, "
+                    "year, isbn, pages, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(p, on_disk[p][0], on_disk[p][1], r["extension"], r["title"], r["author"],
+                      r["year"], r["isbn"], r["pages"], r["error"]) for p, r in zip(changed, records)]
+                )
+                db.executemany("DELETE FROM books WHERE path = ?", [(p,) for p in removed])
+
+        return {
+            "added": sum(1 for p in changed if p not in known),
+            "updated": sum(1 for p in changed if p in known),
+            "removed": len(removed),
+            "unchanged": len(on_disk) - len(changed),
+        }
+
+    def search(self, query: str = "", limit: int = 50) -> list:
+        """
+        Search the local shelf by title, author or ISBN.
+        Every word of the query must match one of those fields.
+
+        Returns:
+            List of dicts with the same keys as AnnasArchiveSearcher results
+            ('title', 'author', 'year', 'extension', 'link') plus 'path',
+            'isbn' and 'pages'. 'link' is the local path.
+        """
+        sql = "SELECT path, title, author, year, extension, isbn, pages FROM books"
+        params = []
+        words = query.split()
+        if words:
+            clauses = []
+            for word in words:
+                clauses.append("(title LIKE ? OR author LIKE ? OR REPLACE(isbn, '-', '') LIKE ?)")
+                like = f"%{word}%"
+                params.extend([like, like, f"%{word.replace('-', '')}%"])
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY title COLLATE NOCASE LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as db:
+            rows = db.execute(sql, params).fetchall()
+        return [
+            {"path": path, "link": path, "title": title, "author": author or "Unknown",
+             "year": year or "", "extension": ext, "isbn": isbn or "", "pages": pages}
+            for path, title, author, year, ext, isbn, pages in rows
+        ]
+
+
+def _map_parallel(func, items: list, workers: int = None) -> list:
+    """Run func over items in a process pool (inline for tiny batches)."""
+    if len(items) <= 2 or workers == 1:
+        return [func(item) for item in items]
+    with _pool(workers) as pool:
+        return list(pool.map(func, items, chunksize=max(1, len(items) // 32)))
+
+
+def _imap_parallel(func, items: list, workers: int = None):
+    """
+    Like _map_parallel, but yield results in order as they finish, with at
+    most a few tasks per worker in flight, so large results (e.g. the text
+    of a whole book) never pile up in the parent process.
+    """
+    if len(items) <= 2 or workers == 1:
+        yield from map(func, items)
+        return
+    window = 4 * (workers or os.cpu_count() or 1)
+    with _pool(workers) as pool:
+        pending = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _pool(workers: int = None) -> ProcessPoolExecutor:
+    # Forking from a worker thread (e.g. the TUI) can deadlock on locks held by
+    # other threads, so spawn fresh interpreters there instead
+    context = None
+    if threading.current_thread() is not threading.main_thread():
+        context = multiprocessing.get_context("spawn")
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+# ── Metadata extraction (module level so it pickles for the pool) ──
+
+def extract_metadata(path: str) -> dict:
+    """Extract title/author/year/isbn/pages from an EPUB or PDF."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    record = {"extension": ext, "title": None, "author": None, "year": None,
+              "isbn": None, "pages": None, "error": None}
+    try:
+        if ext == "epub":
+            record.update(_epub_metadata(path))
+        elif ext == "pdf":
+            record.update(_pdf_metadata(path))
+    except Exception as e:
+        record["error"] = str(e)[:200]
+    if not record["title"]:
+        record["title"] = os.path.splitext(os.path.basename(path))[0]
+    return record
+
+
+def _epub_metadata(path: str) -> dict:
+    with zipfile.ZipFile(path) as zf:
+        container = ET.fromstring(zf.read("META-INF/container.xml"))
+        rootfile = container.find(".//c:rootfile", _NS)
+        opf_path = rootfile.get("full-path")
+        opf = ET.fromstring(zf.read(opf_path))
+
+        meta = opf.find("opf:metadata", _NS)
+        if meta is None:
+            return {}
+
+        def text(tag):
+            el = meta.find(f"dc:{tag}", _NS)
+            return el.text.strip() if el is not None and el.text else None
+
+        authors = [el.text.strip() for el in meta.findall("dc:creator", _NS) if el.text]
+        date = text("date")
+
+        isbn = None
+        for el in meta.findall("dc:identifier", _NS):
+            value = (el.text or "").strip()
+            scheme = "".join(v for k, v in el.attrib.items() if k.endswith("scheme")).lower()
+            if scheme == "isbn" or value.lower().startswith(("urn:isbn:", "isbn")) or _ISBN_RE.fullmatch(value):
+                isbn = _normalize_isbn(value)
+                if isbn:
+                    break
+
+        # EPUBs have no fixed page count; use the page-list if the book ships one
+        pages = None
+        nav_items = [item.get("href") for item in opf.findall("opf:manifest/opf:item", _NS)
+                     if "nav" in (item.get("properties") or "").split()]
+        if nav_items:
+            nav_path = posixpath.join(posixpath.dirname(opf_path), nav_items[0])
+            try:
+                nav = zf.read(nav_path).decode("utf-8", "replace")
+                match = re.search(r'epub:type="page-list".*?</nav>', nav, re.S)
+                if match:
+                    pages = len(re.findall(r"<li\b", match.group(0))) or None
+            except KeyError:
+                pass
+
+    year = _YEAR_RE.search(date).group(1) if date and _YEAR_RE.search(date) else None
+    return {"title": text("title"), "author": ", ".join(authors) or None,
+            "year": year, "isbn": isbn, "pages": pages}
+
+
+def _pdf_metadata(path: str) -> dict:
+    """PDF info dictionary via pypdf, or a raw scan if pypdf is missing."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _pdf_metadata_raw(path)
+
+    reader = PdfReader(path)
+    info = reader.metadata or {}
+    date = str(info.get("/CreationDate") or "")
+    year = _YEAR_RE.search(date)
+    isbn_source = " ".join(str(info.get(k) or "") for k in ("/Subject", "/Keywords", "/Title"))
+    return {
+        "title": str(info.get("/Title") or "").strip() or None,
+        "author": str(info.get("/Author") or "").strip() or None,
+        "year": year.group(1) if year else None,
+        "isbn": _find_isbn(isbn_source),
+        "pages": len(reader.pages),
+    }
+
+
+def _pdf_metadata_raw(path: str) -> dict:
+    """Best-effort scan of an uncompressed Info dictionary and page tree."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    def field(name):
+        match = re.search(rb"/" + name + rb"\s*(\((?:\\.|[^\\)])*\)|<[0-9A-Fa-f\s]*>)", data)
+        return _pdf_string(match.group(1)) if match else None
+
+    counts = [int(c) for c in re.findall(rb"/Type\s*/Pages\b[^>]*?/Count\s+(\d+)", data)]
+    counts += [int(c) for c in re.findall(rb"/Count\s+(\d+)[^>]*?/Type\s*/Pages\b", data)]
+    date = field(b"CreationDate") or ""
+    year = _YEAR_RE.search(date)
+    return {
+        "title": field(b"Title"),
+        "author": field(b"Author"),
+        "year": year.group(1) if year else None,
+        "isbn": _find_isbn(" ".join(filter(None, [field(b"Subject"), field(b"Keywords")]))),
+        "pages": max(counts) if counts else None,
+    }
+
+
+def _pdf_string(raw: bytes) -> str:
+    if raw.startswith(b"<"):
+        data = bytes.fromhex(re.sub(rb"\s", b"", raw[1:-1]).decode())
+    else:
+        data = re.sub(rb"\\([0-7]{1,3}|[\s\S])", _pdf_unescape, raw[1:-1])
+    if data.startswith(b"\xfe\xff"):
+        return data[2:].decode("utf-16-be", "replace").strip() or None
+    return data.decode("latin-1").strip() or None
+
+
+def _pdf_unescape(match) -> bytes:
+    esc = match.group(1)
+    if esc[:1].isdigit():
+        return bytes([int(esc, 8) & 0xFF])
+    return {b"n": b"\n", b"r": b"\r", b"t": b"\t", b"b": b"\b", b"f": b"\f",
+            b"\n": b"", b"\r": b""}.get(esc, esc)
+
+
+def _find_isbn(text: str):
+    for match in _ISBN_RE.finditer(text or ""):
+        isbn = _normalize_isbn(match.group(1))
+        if isbn:
+            return isbn
+    return None
+
+
+def _normalize_isbn(value: str):
+    digits = re.sub(r"[^0-9Xx]", "", value).upper()
+    return digits if len(digits) in (10, 13) else None
@@ -1,7 +1,12 @@
 import requests
 import os
 
+from cantares.core.metrics import Metrics
+
 class BookDownloader:
+    def __init__(self, metrics=None):
+        self.metrics = metrics or Metrics.from_env("books")
+
     def download(self, url: str, filename: str, progress_callback=None) -> str:
         """
         Downloads a file from the given URL.
@@ -21,19 +26,23 @@ class BookDownloader:
             
         filepath = os.path.join(base_dir, filename)
         
-        # Stream download
-        response = requests.get(url, stream=True)
-        response.raise_for_status()
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
-        with open(filepath, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
-                    downloaded += len(chunk)
-                    if progress_callback:
-                        progress_callback(downloaded, total_size)
+        with self.metrics.stage("book_download", label=filename) as stage:
+            # Stream download
+            stage.add("api_calls")
+            response = requests.get(url, stream=True)
+            response.raise_for_status()
+            
+            total_size = int(response.headers.get('content-length', 0))
+            downloaded = 0
+            
+            with open(filepath, "wb") as f:
+                for chunk in response.iter_content(chunk_size=8192):
+                    if chunk:
+                        f.write(chunk)
+                        downloaded += len(chunk)
+                        if progress_callback:
+                            progress_callback(downloaded, total_size)
+            
+            stage.add("bytes", downloaded)
                         
         return os.path.abspath(filepath)
@@ -0,0 +1,244 @@
+import re
+import zlib
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+
+from cantares.books.catalog import BookCatalog, _imap_parallel, _NS, _pdf_string
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fulltext_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    fts_rowid INTEGER,
+    chars INTEGER,
+    error TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS fulltext USING fts5(
+    path UNINDEXED,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+"""
+
+_BATCH_SIZE = 16  # Books per transaction while indexing
+
+
+class FullTextIndex:
+    """
+    Full-text index (SQLite FTS5) over the text inside the local books.
+
+    Lives in the same database as BookCatalog and follows it: after the
+    catalog refresh, only books whose mtime or size changed since they were
+    last indexed get their text re-extracted, in a process pool.
+    """
+
+    def __init__(self, catalog: BookCatalog = None, books_dir: str = "Books"):
+        self.catalog = catalog or BookCatalog(books_dir)
+        self.metrics = self.catalog.metrics
+        with self.catalog._connect() as db:
+            columns = {row[1] for row in db.execute("PRAGMA table_info(fulltext_files)")}
+            if columns and "fts_rowid" not in columns:
+                # Index from an older layout: it's derived data, rebuild it
+                db.executescript("DROP TABLE fulltext_files; DROP TABLE IF EXISTS fulltext;")
+            db.executescript(_SCHEMA)
+
+    def refresh(self, workers: int = None) -> dict:
+        """
+        Refresh the catalog, then (re)index new or changed books.
+
+        Text is written and committed in batches as it is extracted, so memory
+        stays bounded and an interrupted first index keeps what it finished.
+        A book whose text could not be extracted is retried only once the
+        file changes.
+
+        Returns:
+            Dict with 'indexed', 'removed' and 'unchanged' counts, plus
+            'errors': books currently in the index whose text couldn't be read.
+        """
+        self.catalog.refresh(workers=workers)
+
+        with self.metrics.stage("fulltext_index") as stage:
+            with self.catalog._connect() as db:
+                books = {p: (m, s) for p, m, s in db.execute("SELECT path, mtime, size FROM books")}
+                indexed = {p: ((m, s), rowid) for p, m, s, rowid in
+                           db.execute("SELECT path, mtime, size, fts_rowid FROM fulltext_files")}
+
+            changed = [p for p, sig in books.items() if p not in indexed or indexed[p][0] != sig]
+            removed = [p for p in indexed if p not in books]
+            stage.add("cache_hits", len(books) - len(changed))
+
+            self._forget(removed, indexed)
+            batch = []
+            for path, result in zip(changed, _imap_parallel(extract_text, changed, workers)):
+                batch.append((path, result))
+                if len(batch) >= _BATCH_SIZE:
+                    self._store(batch, books, indexed, stage)
+                    batch = []
+            self._store(batch, books, indexed, stage)
+
+            with self.catalog._connect() as db:
+                errors = db.execute("SELECT COUNT(*) FROM fulltext_files WHERE error IS NOT NULL").fetchone()[0]
+
+        return {"indexed": len(changed), "removed": len(removed),
+                "unchanged": len(books) - len(changed), "errors": errors}
+
+    def _forget(self, paths: list, indexed: dict, db=None):
+        """Drop the index rows of these books (path is UNINDEXED in FTS, so go by rowid)."""
+        if db is None:
+            with self.catalog._connect() as db:
+                return self._forget(paths, indexed, db)
+        stale = [p for p in paths if p in indexed]
+        db.executemany("DELETE FROM fulltext WHERE rowid = ?",
+                       [(indexed[p][1],) for p in stale if indexed[p][1] is not None])
+        db.executemany("DELETE FROM fulltext_files WHERE path = ?", [(p,) for p in stale])
+
+    def _store(self, batch: list, books: dict, indexed: dict, stage):
+        """Replace the index rows of one batch of books in a single transaction."""
+        if not batch:
+            return
+        with self.catalog._connect() as db:
+            self._forget([path for path, _ in batch], indexed, db)
+            for path, (text, error) in batch:
+                rowid = None
+                if text:
+                    rowid = db.execute("INSERT INTO fulltext (path, body) VALUES (?, ?)",
+                                       (path, text)).lastrowid
+                db.execute(
+                    "INSERT INTO fulltext_files (path, mtime, size, fts_rowid, chars, error) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (path, books[path][0], books[path][1], rowid, len(text), error)
+                )
+        stage.add("bytes", sum(books[path][1] for path, _ in batch))
+        stage.add("errors", sum(1 for _, (_, error) in batch if error))
+
+    def search(self, query: str, limit: int = 20, markers=("«", "»")) -> list:
+        """
+        Ranked (BM25) search inside the books.
+
+        Every word of the query must appear in the book; words are matched as
+        literal terms, so FTS5 syntax characters in the input are harmless.
+
+        Returns:
+            List of dicts with 'title', 'author', 'year', 'extension', 'link'
+            (local path), 'path', 'snippet' and 'score' (lower is better).
+        """
+        terms = [f'"{word.replace(chr(34), chr(34) * 2)}"' for word in query.split()]
+        if not terms:
+            return []
+
+        sql = (
+            "SELECT f.path, b.title, b.author, b.year, b.extension, "
+            "snippet(fulltext, 1, ?, ?, '…', 16), bm25(fulltext) AS score "
+            "FROM fulltext f JOIN books b ON b.path = f.path "
+            "WHERE fulltext MATCH ? ORDER BY score LIMIT ?"
+        )
+        with self.catalog._connect() as db:
+            rows = db.execute(sql, (markers[0], markers[1], " ".join(terms), limit)).fetchall()
+        return [
+            {"path": path, "link": path, "title": title, "author": author or "Unknown",
+             "year": year or "", "extension": ext, "snippet": " ".join(snippet.split()),
+             "score": score}
+            for path, title, author, year, ext, snippet, score in rows
+        ]
+
+
+# ── Text extraction (module level so it pickles for the pool) ──
+
+def extract_text(path: str) -> tuple:
+    """Extract the plain text of an EPUB or PDF. Returns (text, error)."""
+    try:
+        if path.lower().endswith(".epub"):
+            return _epub_text(path), None
+        if path.lower().endswith(".pdf"):
+            return _pdf_text(path), None
+    except Exception as e:
+        return "", str(e)[:200] or type(e).__name__
+    return "", None
+
+
+class _TextParser(HTMLParser):
+    """Collect the visible text of an XHTML document."""
+
+    _SKIP = {"script", "style", "head"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skipping += 1
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def _epub_text(path: str) -> str:
+    with zipfile.ZipFile(path) as zf:
+        container = ET.fromstring(zf.read("META-INF/container.xml"))
+        opf_path = container.find(".//c:rootfile", _NS).get("full-path")
+        opf = ET.fromstring(zf.read(opf_path))
+        base = posixpath.dirname(opf_path)
+
+        manifest = {item.get("id"): item.get("href")
+                    for item in opf.findall("opf:manifest/opf:item", _NS)}
+        spine = [manifest.get(ref.get("idref")) for ref in opf.findall("opf:spine/opf:itemref", _NS)]
+
+        chapters = []
+        for href in filter(None, spine):
+            try:
+                html = zf.read(posixpath.normpath(posixpath.join(base, href)))
+            except KeyError:
+                continue
+            parser = _TextParser()
+            parser.feed(html.decode("utf-8", "replace"))
+            chapters.append(" ".join(" ".join(parser.parts).split()))
+    return "\n".join(chapters)
+
+
+def _pdf_text(path: str) -> str:
+    """Page text via pypdf, or a raw scan of the content streams if it's missing."""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _pdf_text_raw(path)
+
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+_STREAM_RE = re.compile(rb"<<([^<>]*(?:<<[^<>]*>>[^<>]*)*)>>\s*stream\r?\n(.*?)\r?\nendstream", re.S)
+_TEXT_OP_RE = re.compile(rb"(\((?:\\.|[^\\)])*\))\s*(?:Tj|'|\")|\[((?:\\.|[^\]])*)\]\s*TJ", re.S)
+_STRING_RE = re.compile(rb"\((?:\\.|[^\\)])*\)")
+
+
+def _pdf_text_raw(path: str) -> str:
+    """Best-effort: literal strings shown by Tj/TJ in (Flate) content streams."""
+    with open(path, "rb") as f:
+        data = f.read()
+
+    parts = []
+    for header, stream in _STREAM_RE.findall(data):
+        if b"/FlateDecode" in header:
+            try:
+                stream = zlib.decompress(stream)
+            except zlib.error:
+                continue
+        elif b"/Filter" in header:
+            continue
+        for single, array in _TEXT_OP_RE.findall(stream):
+            # TJ arrays split words for kerning, so their pieces join without spaces
+            strings = [single] if single else _STRING_RE.findall(array)
+            text = "".join(filter(None, (_pdf_string(s) for s in strings)))
+            if text:
+                parts.append(text)
+    return " ".join(parts)
@@ -0,0 +1,137 @@
+"""
+checkpoint.py — Checkpoints reanudables para exports grandes a CSV.
+
+El export escribe en `<archivo>.part` y, después de cada página, guarda en
+`<archivo>.checkpoint.json` qué playlists ya terminaron, en qué offset va la
+actual y cuántos bytes del `.part` son válidos. Si el proceso muere (token
+expirado, crash), la siguiente corrida trunca el `.part` a ese tamaño y
+sigue desde el offset guardado. Al terminar, el `.part` se renombra
+atómicamente al archivo final, así que nunca queda un CSV a medias.
+"""
+
+import os
+import csv
+import json
+from typing import List, Optional
+
+CSV_HEADER = ["Track Name", "Artist Name", "Album Name", "Playlist", "URI"]
+
+
+class ExportCheckpoint:
+    """Estado reanudable de un export a CSV."""
+
+    def __init__(self, filename: str, fingerprint: str = ""):
+        self.filename = filename
+        self.part_path = f"{filename}.part"
+        self.state_path = f"{filename}.checkpoint.json"
+        self.fingerprint = fingerprint
+        self.done: List[str] = []
+        self.current: Optional[str] = None
+        self.offset = 0
+        self.tracks = 0
+        self.size = 0
+        self.resumed = False
+        self._file = None
+
+    # ----------------------------------------------------------
+    #  Ciclo de vida
+    # ----------------------------------------------------------
+
+    def load(self) -> bool:
+        """Cargar checkpoint previo. True si es válido para este export."""
+        if not (os.path.exists(self.state_path) and os.path.exists(self.part_path)):
+            return False
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if state.get("fingerprint") != self.fingerprint:
+            return False
+        if os.path.getsize(self.part_path) < state.get("size", 0):
+            return False
+
+        self.done = list(state.get("done", []))
+        self.current = state.get("current")
+        self.offset = int(state.get("offset", 0))
+        self.tracks = int(state.get("tracks", 0))
+        self.size = int(state.get("size", 0))
+        self.resumed = True
+        return True
+
+    def open(self):
+        """Abrir el `.part`: truncado al último checkpoint, o nuevo con header."""
+        if self.resumed:
+            with open(self.part_path, "r+b") as f:
+                f.truncate(self.size)
+            self._file = open(self.part_path, "a", newline="", encoding="utf-8")
+        else:
+            self._file = open(self.part_path, "w", newline="", encoding="utf-8")
+            csv.writer(self._file).writerow(CSV_HEADER)
+            self._save()
+        return self._file
+
+    def commit(self):
+        """Cerrar y renombrar atómicamente el `.part` al archivo final."""
+        self._sync()
+        self._file.close()
+        self._file = None
+        os.replace(self.part_path, self.filename)
+        self.discard()
+
+    def close(self):
+        """Cerrar sin publicar (el checkpoint queda para reanudar)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        for path in (self.state_path, f"{self.state_path}.tmp"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    # ----------------------------------------------------------
+    #  Progreso
+    # ----------------------------------------------------------
+
+    def is_done(self, key: str) -> bool:
+        return key in self.done
+
+    def start_offset(self, key: str) -> int:
+        """Offset desde el cual paginar `key` (0 si no es la que quedó a medias)."""
+        return self.offset if key == self.current else 0
+
+    def page_done(self, key: str, next_offset: int, written: int):
+        """Marcar una página de `key` como escrita."""
+        self.current = key
+        self.offset = next_offset
+        self.tracks += written
+        self._save()
+
+    def source_done(self, key: str, written: int = 0):
+        """Marcar una playlist (o Liked Songs) como completa."""
+        self.done.append(key)
+        self.current = None
+        self.offset = 0
+        self.tracks += written
+        self._save()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _save(self):
+        self._sync()
+        self.size = os.path.getsize(self.part_path)
+        state = {
+            "fingerprint": self.fingerprint,
+            "done": self.done,
+            "current": self.current,
+            "offset": self.offset,
+            "tracks": self.tracks,
+            "size": self.size,
+        }
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
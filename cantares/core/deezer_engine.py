@@ -22,6 +22,8 @@ from typing import Callable, Optional, List
 from Crypto.Cipher import Blowfish, AES
 from dotenv import load_dotenv
 
+from cantares.core.metrics import Metrics
+
 load_dotenv()
 
 logger = logging.getLogger('cantares.deezer')
@@ -132,12 +134,14 @@ class DeezerEngine:
     def __init__(self, output_dir: str = "Downloads", 
                  quality: Quality = Quality.FLAC,
                  arl: str = None,
-                 progress_callback: Callable = None):
+                 progress_callback: Callable = None,
+                 metrics: Metrics = None):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.quality = quality
         self.arl = arl or os.getenv("DEEZER_ARL", "")
         self.progress_callback = progress_callback
+        self.metrics = metrics or Metrics("deezer")
         self._cancelled = False
         
         # Session HTTP
@@ -281,9 +285,10 @@ class DeezerEngine:
                 )
             
             # 2) Resolver calidad y obtener URL
-            quality, url = self._resolve_url(
-                sng_id, md5_origin, media_version, track_token
-            )
+            with self.metrics.stage("deezer_resolve"):
+                quality, url = self._resolve_url(
+                    sng_id, md5_origin, media_version, track_token
+                )
             if not url:
                 return DeezerResult(
                     success=False, title=title, artist=artist,
@@ -306,7 +311,8 @@ class DeezerEngine:
             
             # 4) Descargar y descifrar
             bf_key = _gen_bf_key(sng_id)
-            self._download_and_decrypt(url, filepath, bf_key)
+            with self.metrics.stage("deezer_stream"):
+                self._download_and_decrypt(url, filepath, bf_key)
             
             if not filepath.exists():
                 return DeezerResult(
@@ -316,7 +322,8 @@ class DeezerEngine:
             
             # 5) Tag metadata
             cover_url = self._get_cover_url(track_info)
-            self._tag_file(filepath, track_info, cover_url)
+            with self.metrics.stage("deezer_tag"):
+                self._tag_file(filepath, track_info, cover_url)
             
             size = filepath.stat().st_size
             return DeezerResult(
@@ -389,6 +396,7 @@ class DeezerEngine:
         }
         
         try:
+            self.metrics.count("api_calls")
             resp = self.session.post(_GW_URL, params=params, json=body, timeout=30)
             resp.raise_for_status()
             data = resp.json()
@@ -402,6 +410,7 @@ class DeezerEngine:
                 ]:
                     self._refresh_token()
                     params["api_token"] = self.token
+                    self.metrics.count("api_calls")
                     resp = self.session.post(_GW_URL, params=params, json=body, timeout=30)
                     data = resp.json()
                 else:
@@ -464,6 +473,7 @@ class DeezerEngine:
     def _get_url_via_api(self, track_token: str, format_name: str) -> Optional[str]:
         """Obtener URL via media API (metodo moderno)."""
         try:
+            self.metrics.count("api_calls")
             resp = self.session.post(
                 "https://media.deezer.com/v1/get_url",
                 json={
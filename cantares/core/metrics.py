@@ -0,0 +1,304 @@
+"""
+metrics.py — Eventos estructurados y métricas por etapa de Cantares.
+
+Cada trabajo (export, descarga por lote, escaneo de librería) reporta
+eventos en lugar de strings sueltos:
+
+  - start/stop de etapa, con duración y contadores (bytes, api_calls, cache_hits...)
+  - progress, con mensaje, porcentaje y paso actual
+
+Los callbacks de siempre (`update_callback(msg)`, `callback(current, total, msg)`,
+`ProgressCallback(msg, pct, result)`) son solo renderers de estos eventos.
+Los eventos se pueden volcar a JSON lines y el resumen a un archivo de
+texto estilo Prometheus para perfilar qué etapa es la lenta.
+
+Si `CANTARES_METRICS_DIR` está definido en el entorno, `Metrics.from_env`
+escribe ahí `<job>.jsonl` y `<job>.prom` automáticamente.
+"""
+
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class MetricEvent:
+    """Evento estructurado de un trabajo."""
+    kind: str  # 'start', 'stop' o 'progress'
+    job: str
+    stage: str = ""
+    label: str = ""
+    ts: float = 0.0
+    duration_sec: Optional[float] = None
+    message: str = ""
+    percent: Optional[int] = None
+    current: Optional[int] = None
+    total: Optional[int] = None
+    counters: Dict[str, float] = field(default_factory=dict)
+    result: Any = None  # Payload para renderers (ej. TrackResult), no se serializa
+
+    def to_dict(self) -> dict:
+        data = {"kind": self.kind, "job": self.job, "stage": self.stage, "ts": round(self.ts, 6)}
+        for key in ("label", "message", "percent", "current", "total"):
+            value = getattr(self, key)
+            if value not in (None, ""):
+                data[key] = value
+        if self.duration_sec is not None:
+            data["duration_sec"] = round(self.duration_sec, 6)
+        if self.counters:
+            data["counters"] = dict(self.counters)
+        return data
+
+
+Renderer = Callable[[MetricEvent], None]
+
+
+class Stage:
+    """Etapa abierta. Acumula sus contadores hasta que se cierra."""
+
+    def __init__(self, name: str, label: str = "", parent: Optional["Stage"] = None,
+                 metrics: Optional["Metrics"] = None):
+        self.name = name
+        self.label = label
+        self.parent = parent
+        self.started = time.perf_counter()
+        self.counters: Dict[str, float] = {}
+        self._metrics = metrics
+
+    def add(self, counter: str, value: float = 1):
+        """Sumar a esta etapa y a las que la contienen."""
+        node = self
+        while node is not None:
+            node.counters[counter] = node.counters.get(counter, 0) + value
+            node = node.parent
+        if self._metrics is not None:
+            self._metrics._add_total(counter, value)
+
+
+@dataclass
+class StageStats:
+    """Agregado de todas las ejecuciones de una etapa."""
+    count: int = 0
+    duration_sum: float = 0.0
+    duration_max: float = 0.0
+    counters: Dict[str, float] = field(default_factory=dict)
+
+
+class Metrics:
+    """
+    Colector de eventos y métricas por etapa.
+
+    Thread-safe: cada hilo lleva su propia pila de etapas abiertas, y
+    `count()` suma en todas las etapas abiertas del hilo (los contadores
+    de una etapa incluyen los de sus sub-etapas).
+    """
+
+    def __init__(self, job: str = "cantares", prometheus_path: Optional[str] = None):
+        self.job = job
+        self.prometheus_path = Path(prometheus_path) if prometheus_path else None
+        self.stats: Dict[str, StageStats] = {}
+        self.totals: Dict[str, float] = {}
+        self._renderers: List[Renderer] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def from_env(cls, job: str) -> "Metrics":
+        """Metrics con sinks JSONL/Prometheus si CANTARES_METRICS_DIR está definido."""
+        metrics_dir = os.getenv("CANTARES_METRICS_DIR")
+        if not metrics_dir:
+            return cls(job)
+        out = Path(metrics_dir)
+        out.mkdir(parents=True, exist_ok=True)
+        metrics = cls(job, prometheus_path=str(out / f"{job}.prom"))
+        metrics.subscribe(JsonLinesSink(str(out / f"{job}.jsonl")))
+        return metrics
+
+    # ----------------------------------------------------------
+    #  Renderers
+    # ----------------------------------------------------------
+
+    def subscribe(self, renderer: Renderer) -> Callable[[], None]:
+        """Registrar un renderer. Retorna una función para desregistrarlo."""
+        with self._lock:
+            self._renderers.append(renderer)
+
+        def unsubscribe():
+            with self._lock:
+                if renderer in self._renderers:
+                    self._renderers.remove(renderer)
+        return unsubscribe
+
+    def emit(self, event: MetricEvent) -> MetricEvent:
+        with self._lock:
+            renderers = list(self._renderers)
+        for renderer in renderers:
+            renderer(event)
+        return event
+
+    # ----------------------------------------------------------
+    #  Etapas y contadores
+    # ----------------------------------------------------------
+
+    @property
+    def _stack(self) -> List[Stage]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def stage(self, name: str, label: str = ""):
+        """Medir una etapa: emite start, y stop con duración y contadores."""
+        stack = self._stack
+        current = Stage(name, label, parent=stack[-1] if stack else None, metrics=self)
+        stack.append(current)
+        self.emit(MetricEvent("start", self.job, stage=name, label=label, ts=time.time()))
+        try:
+            yield current
+        finally:
+            self._stack.pop()
+            duration = time.perf_counter() - current.started
+            with self._lock:
+                stats = self.stats.setdefault(name, StageStats())
+                stats.count += 1
+                stats.duration_sum += duration
+                stats.duration_max = max(stats.duration_max, duration)
+                for key, value in current.counters.items():
+                    stats.counters[key] = stats.counters.get(key, 0) + value
+            self.emit(MetricEvent("stop", self.job, stage=name, label=label, ts=time.time(),
+                                  duration_sec=duration, counters=dict(current.counters)))
+            if not self._stack and self.prometheus_path:
+                self.write_prometheus(str(self.prometheus_path))
+
+    def count(self, counter: str, value: float = 1):
+        """Sumar a un contador en todas las etapas abiertas del hilo."""
+        stack = self._stack
+        if stack:
+            stack[-1].add(counter, value)
+        else:
+            self._add_total(counter, value)
+
+    def _add_total(self, counter: str, value: float):
+        with self._lock:
+            self.totals[counter] = self.totals.get(counter, 0) + value
+
+    def progress(self, message: str = "", percent: Optional[int] = None,
+                 current: Optional[int] = None, total: Optional[int] = None,
+                 result: Any = None) -> MetricEvent:
+        """Emitir un evento de progreso dentro de la etapa actual."""
+        stack = self._stack
+        open_stage = stack[-1] if stack else None
+        return self.emit(MetricEvent(
+            "progress", self.job,
+            stage=open_stage.name if open_stage else "",
+            label=open_stage.label if open_stage else "",
+            ts=time.time(), message=message, percent=percent,
+            current=current, total=total, result=result,
+        ))
+
+    # ----------------------------------------------------------
+    #  Export
+    # ----------------------------------------------------------
+
+    def prometheus_text(self) -> str:
+        """Resumen en formato de texto de Prometheus."""
+        job = _escape_label(self.job)
+        with self._lock:
+            stats = {name: StageStats(s.count, s.duration_sum, s.duration_max, dict(s.counters))
+                     for name, s in self.stats.items()}
+            totals = dict(self.totals)
+
+        lines = [
+            "# HELP cantares_stage_duration_seconds Duracion de cada etapa.",
+            "# TYPE cantares_stage_duration_seconds summary",
+        ]
+        for name, s in sorted(stats.items()):
+            labels = f'job="{job}",stage="{_escape_label(name)}"'
+            lines.append(f"cantares_stage_duration_seconds_sum{{{labels}}} {s.duration_sum:.6f}")
+            lines.append(f"cantares_stage_duration_seconds_count{{{labels}}} {s.count}")
+        lines.append("# TYPE cantares_stage_duration_max_seconds gauge")
+        for name, s in sorted(stats.items()):
+            labels = f'job="{job}",stage="{_escape_label(name)}"'
+            lines.append(f"cantares_stage_duration_max_seconds{{{labels}}} {s.duration_max:.6f}")
+
+        for counter in sorted(totals):
+            metric = f"cantares_{_metric_name(counter)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f'{metric}{{job="{job}"}} {_fmt(totals[counter])}')
+
+        # Por etapa va en otra familia: el valor de una etapa incluye el de sus
+        # sub-etapas, así que mezclarlo con el total haría que sum() cuente doble.
+        stage_counters = sorted({c for s in stats.values() for c in s.counters})
+        for counter in stage_counters:
+            metric = f"cantares_stage_{_metric_name(counter)}_total"
+            lines.append(f"# HELP {metric} Valor inclusivo por etapa (incluye sub-etapas).")
+            lines.append(f"# TYPE {metric} counter")
+            for name, s in sorted(stats.items()):
+                if counter in s.counters:
+                    labels = f'job="{job}",stage="{_escape_label(name)}"'
+                    lines.append(f"{metric}{{{labels}}} {_fmt(s.counters[counter])}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: str):
+        """Escribir el resumen (atómico: tmp + rename, para scrapers de textfile)."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.prometheus_text())
+        os.replace(tmp, path)
+
+
+class JsonLinesSink:
+    """Renderer que agrega cada evento como una línea JSON."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event: MetricEvent):
+        line = json.dumps(event.to_dict(), ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+# ── Renderers para los callbacks existentes ──────────────
+
+def message_renderer(update_callback: Callable[[str], None]) -> Renderer:
+    """Adaptar `update_callback(msg)`: solo eventos de progreso con mensaje."""
+    def render(event: MetricEvent):
+        if event.kind == "progress" and event.message:
+            update_callback(event.message)
+    return render
+
+
+def step_renderer(callback: Callable[[int, int, str], None]) -> Renderer:
+    """Adaptar `callback(current, total, msg)`."""
+    def render(event: MetricEvent):
+        if event.kind == "progress" and event.current is not None:
+            callback(event.current, event.total or 0, event.message)
+    return render
+
+
+def progress_renderer(callback: Callable) -> Renderer:
+    """Adaptar `ProgressCallback(msg, percent, result)`."""
+    def render(event: MetricEvent):
+        if event.kind == "progress":
+            callback(event.message, event.percent or 0, event.result)
+    return render
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _metric_name(counter: str) -> str:
+    return "".join(c if c.isalnum() else "_" for c in counter.lower())
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.6f}"
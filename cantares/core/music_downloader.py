@@ -19,6 +19,8 @@ from enum import Enum
 
 import yt_dlp
 
+from cantares.core.metrics import Metrics, progress_renderer
+
 
 class DownloadStatus(Enum):
     PENDING = "pending"
@@ -110,16 +112,22 @@ class MusicDownloader:
         return None
     
     def __init__(self, download_dir: str = "Downloads", callback: Optional[ProgressCallback] = None,
-                 use_deezer: bool = True):
+                 use_deezer: bool = True, metrics: Optional[Metrics] = None):
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         self.callback = callback or self._default_callback
         self._cancelled = False
         self._use_deezer = use_deezer
         self._deezer = None  # Lazy init
+        self.metrics = metrics or Metrics.from_env("download")
         
     def _default_callback(self, msg: str, percent: int = 0, result: Optional[TrackResult] = None):
         print(f"[{percent:3d}%] {msg}", flush=True)
+
+    def _report(self, cb: ProgressCallback, msg: str, percent: int = 0,
+                result: Optional[TrackResult] = None):
+        """Emitir evento de progreso; el callback es solo su renderer."""
+        progress_renderer(cb)(self.metrics.progress(msg, percent=percent, result=result))
     
     def cancel(self):
         """Cancelar descarga en progreso."""
@@ -173,7 +181,8 @@ class MusicDownloader:
                 from cantares.core.deezer_engine import DeezerEngine, Quality
                 self._deezer = DeezerEngine(
                     output_dir=output_dir,
-                    quality=Quality.FLAC  # Intentar FLAC, fallback automatico
+                    quality=Quality.FLAC,  # Intentar FLAC, fallback automatico
+                    metrics=self.metrics
                 )
                 if not self._deezer.login():
                     self._deezer = None  # ARL invalido, desactivar Deezer
@@ -211,6 +220,19 @@ class MusicDownloader:
         Descarga un solo track.
         Estrategia: Deezer primero (FLAC/320/128), YouTube como fallback.
         """
+        with self.metrics.stage("track", label=f"{artist} - {track_name}"):
+            result = self._download_single(artist, track_name, album, output_dir)
+            if result.status == DownloadStatus.SKIPPED:
+                self.metrics.count("cache_hits")
+            elif result.status == DownloadStatus.COMPLETE:
+                self.metrics.count("bytes", int(result.file_size_mb * 1024 * 1024))
+                self.metrics.count(f"source_{result.source}")
+            else:
+                self.metrics.count("failed")
+        return result
+
+    def _download_single(self, artist: str, track_name: str, album: str,
+                         output_dir: Optional[str]) -> TrackResult:
         result = TrackResult(
             track_name=track_name,
             artist=artist,
@@ -308,6 +330,11 @@ class MusicDownloader:
         cb = callback or self.callback
         self._cancelled = False
         
+        with self.metrics.stage("batch", label=playlist_name):
+            return self._download_batch(tracks, playlist_name, cb)
+
+    def _download_batch(self, tracks: List[Dict], playlist_name: str,
+                        cb: ProgressCallback) -> BatchResult:
         batch = BatchResult(total=len(tracks))
         start_time = time.time()
         
@@ -316,12 +343,12 @@ class MusicDownloader:
         output_dir = str(self.download_dir / pl_folder)
         os.makedirs(output_dir, exist_ok=True)
         
-        cb(f"Playlist: {playlist_name} ({len(tracks)} tracks)", 0, None)
+        self._report(cb, f"Playlist: {playlist_name} ({len(tracks)} tracks)", 0, None)
         
         for idx, track in enumerate(tracks):
             if self._cancelled:
-                cb("⛔ Pfffff... descarga cancelada por el usuario", 
-                   int((idx / batch.total) * 100), None)
+                self._report(cb, "⛔ Pfffff... descarga cancelada por el usuario",
+                             int((idx / batch.total) * 100), None)
                 break
             
             artist = track.get('Artist Name', track.get('artist', 'Unknown'))
@@ -329,25 +356,25 @@ class MusicDownloader:
             album = track.get('Album Name', track.get('album', ''))
             
             progress = int(((idx + 1) / batch.total) * 100)
-            cb(f"[{idx+1}/{batch.total}] {artist} - {name}", progress, None)
+            self._report(cb, f"[{idx+1}/{batch.total}] {artist} - {name}", progress, None)
             
             result = self.download_single(artist, name, album, output_dir)
             batch.tracks.append(result)
             
             if result.status == DownloadStatus.COMPLETE:
                 batch.completed += 1
-                cb(f"  OK: {result.file_size_mb:.1f} MB", progress, result)
+                self._report(cb, f"  OK: {result.file_size_mb:.1f} MB", progress, result)
             elif result.status == DownloadStatus.SKIPPED:
                 batch.skipped += 1
-                cb(f"  SKIP (ya existe): {name}", progress, result)
+                self._report(cb, f"  SKIP (ya existe): {name}", progress, result)
             else:
                 batch.failed += 1
                 batch.failed += 1
-                cb(f"  ❌ Algo tostó: {result.error}", progress, result)
+                self._report(cb, f"  ❌ Algo tostó: {result.error}", progress, result)
         
         batch.elapsed_sec = time.time() - start_time
-        cb(f"¡Así está la calabaza! {batch.completed} OK, {batch.skipped} saltadas, {batch.failed} tostadas "
-           f"({batch.elapsed_sec:.0f}s)", 100, None)
+        self._report(cb, f"¡Así está la calabaza! {batch.completed} OK, {batch.skipped} saltadas, "
+                         f"{batch.failed} tostadas ({batch.elapsed_sec:.0f}s)", 100, None)
         
         return batch
     
@@ -369,17 +396,27 @@ class MusicDownloader:
         cb = callback or self.callback
         
         if not os.path.exists(csv_path):
-            cb(f"Otssss... CSV no encontrado: {csv_path}", 0, None)
+            self._report(cb, f"Otssss... CSV no encontrado: {csv_path}", 0, None)
             return BatchResult()
         
-        # Leer y agrupar por playlist
-        playlists = defaultdict(list)
-        with open(csv_path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                pl = row.get('Playlist', 'Unknown')
-                if selected_playlists is None or pl in selected_playlists:
-                    playlists[pl].append(row)
+        with self.metrics.stage("csv", label=os.path.basename(csv_path)):
+            # Leer y agrupar por playlist
+            playlists = defaultdict(list)
+            with self.metrics.stage("parse") as parse_stage:
+                with open(csv_path, "r", encoding="utf-8") as f:
+                    reader = csv.DictReader(f)
+                    for row in reader:
+                        pl = row.get('Playlist', 'Unknown')
+                        if selected_playlists is None or pl in selected_playlists:
+                            playlists[pl].append(row)
+                parse_stage.add("bytes", os.path.getsize(csv_path))
+            
+            return self._download_queue(playlists, range_config, cb)
+
+    def _download_queue(self, playlists: Dict[str, List[Dict]], range_config: Optional[Dict],
+                        cb: ProgressCallback) -> BatchResult:
+        """Aplica el rango a la cola y descarga agrupando por playlist."""
+        from collections import defaultdict
         
         # Flatten
         all_tracks = []
@@ -393,10 +430,9 @@ class MusicDownloader:
         limit = (range_config or {}).get('limit', len(all_tracks))
         queue = all_tracks[offset:offset + limit]
         
-        cb(f"Cola: {len(queue)} tracks de {len(playlists)} playlists. ¡Vámonos recio!", 0, None)
+        self._report(cb, f"Cola: {len(queue)} tracks de {len(playlists)} playlists. ¡Vámonos recio!", 0, None)
         
         # Agrupar por playlist para descargar en carpetas
-        from collections import defaultdict
         by_playlist = defaultdict(list)
         for t in queue:
             by_playlist[t['_playlist']].append(t)
@@ -453,6 +489,17 @@ def download_track(artist: str, name: str, output_dir: str = "Downloads") -> Tra
     return dl.download_single(artist, name)
 
 
+def csv_playlists(csv_path: str) -> List[str]:
+    """Nombres de las playlists de un CSV exportado, ordenados."""
+    import csv
+
+    playlists = set()
+    with open(csv_path, "r", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            playlists.add(row['Playlist'])
+    return sorted(playlists)
+
+
 def download_liked_songs(spotify_exporter, limit: int = 15, 
                           output_dir: str = "Downloads",
                           callback: Optional[ProgressCallback] = None) -> BatchResult:
@@ -468,10 +515,11 @@ def download_liked_songs(spotify_exporter, limit: int = 15,
     dl = MusicDownloader(download_dir=output_dir, callback=callback)
     
     # Obtener liked songs
-    if callback:
-        callback(f"Jalando {limit} canciones favoritas de Spotify (Aguanta un ratito)...", 0, None)
+    dl._report(dl.callback, f"Jalando {limit} canciones favoritas de Spotify (Aguanta un ratito)...", 0, None)
     
-    liked = spotify_exporter.get_liked_songs(limit=limit)
+    with dl.metrics.stage("liked_fetch") as stage:
+        liked = spotify_exporter.get_liked_songs(limit=limit)
+        stage.add("tracks", len(liked))
     
     # Convertir a formato de tracks
     tracks = []
@@ -485,7 +533,6 @@ def download_liked_songs(spotify_exporter, limit: int = 15,
             'Album Name': t['album']['name'] if t.get('album') else 'Unknown',
         })
     
-    if callback:
-        callback(f"Descargando {len(tracks)} tracks... ¡Arrancamos!", 5, None)
+    dl._report(dl.callback, f"Descargando {len(tracks)} tracks... ¡Arrancamos!", 5, None)
     
     return dl.download_batch(tracks, "Liked Songs", callback=callback)
@@ -5,17 +5,21 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from dotenv import load_dotenv
 
+from cantares.core.checkpoint import ExportCheckpoint
+from cantares.core.metrics import Metrics, step_renderer
+
 # Cargar variables de entorno
 load_dotenv()
 
 class SpotifyExporter:
-    def __init__(self):
+    def __init__(self, metrics=None):
         self.client_id = os.getenv("SPOTIFY_CLIENT_ID")
         self.client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
         self.redirect_uri = "https://nona-xi.vercel.app/callback"
         self.scope = "playlist-read-private user-library-read"
         self.sp = None
         self.user = None
+        self.metrics = metrics or Metrics.from_env("export")
 
     def authenticate(self):
         if not self.client_id or not self.client_secret:
@@ -28,74 +32,101 @@ class SpotifyExporter:
             scope=self.scope,
             open_browser=True
         ))
+        self.metrics.count("api_calls")
         self.user = self.sp.current_user()
         return self.user
 
     def get_playlists(self):
         if not self.sp: self.authenticate()
-        playlists = []
-        results = self.sp.current_user_playlists(limit=50)
-        playlists.extend(results['items'])
-        while results['next']:
-            results = self.sp.next(results)
-            playlists.extend(results['items'])
-        return playlists
+        return self._fetch_all(self.sp.current_user_playlists(limit=50))
 
     def get_playlist_tracks(self, playlist_id):
         if not self.sp: self.authenticate()
-        tracks = []
-        results = self.sp.playlist_items(playlist_id)
-        tracks.extend(results['items'])
-        while results['next']:
-            results = self.sp.next(results)
-            tracks.extend(results['items'])
-        return tracks
+        return self._fetch_all(self.sp.playlist_items(playlist_id))
 
     def get_liked_songs(self, limit=None):
         if not self.sp: self.authenticate()
-        tracks = []
-        results = self.sp.current_user_saved_tracks(limit=50)
-        tracks.extend(results['items'])
+        tracks = self._fetch_all(self.sp.current_user_saved_tracks(limit=50), limit=limit)
+        return tracks[:limit] if limit else tracks
+
+    def _fetch_all(self, results, limit=None):
+        """Recorrer el paginado desde la primera pagina, contando llamadas a la API."""
+        self.metrics.count("api_calls")
+        items = list(results['items'])
         while results['next']:
-            if limit and len(tracks) >= limit: break
+            if limit and len(items) >= limit: break
+            self.metrics.count("api_calls")
             results = self.sp.next(results)
-            tracks.extend(results['items'])
-        return tracks[:limit] if limit else tracks
+            items.extend(results['items'])
+        return items
 
-    def export_to_csv(self, playlists_to_export, include_liked=True, filename="spotify_export.csv", callback=None):
+    def export_to_csv(self, playlists_to_export, include_liked=True, filename="spotify_export.csv", callback=None,
+                      resume=True):
         """
         playlists_to_export: List of playlist dicts (or IDs)
         callback: function(current, total, message)
+        resume: Reanudar desde el checkpoint si el export anterior quedo a medias.
         """
         if not self.sp: self.authenticate()
         
-        mode = "w" if not os.path.exists(filename) else "w" # Always overwrite for new batch? Or append? Let's overwrite for clean state if selected.
-        
         total_steps = len(playlists_to_export) + (1 if include_liked else 0)
         current_step = 0
+        unsubscribe = self.metrics.subscribe(step_renderer(callback)) if callback else (lambda: None)
+
+        # El checkpoint solo vale para la misma seleccion de playlists
+        fingerprint = ",".join(pl['id'] for pl in playlists_to_export) + ("+liked" if include_liked else "")
+        checkpoint = ExportCheckpoint(filename, fingerprint=fingerprint)
+        if not (resume and checkpoint.load()):
+            checkpoint.discard()
+
+        try:
+            with self.metrics.stage("export") as export_stage:
+                writer = csv.writer(checkpoint.open())
+
+                for pl in playlists_to_export:
+                    current_step += 1
+                    if checkpoint.is_done(pl['id']): continue
+                    with self.metrics.stage("playlist", label=pl['name']):
+                        self.metrics.progress(f"Procesando: {pl['name']}", current=current_step, total=total_steps)
+                        self._export_pages(writer, checkpoint, pl['id'], pl['name'],
+                                           lambda offset: self.sp.playlist_items(pl['id'], offset=offset))
+
+                if include_liked:
+                    current_step += 1
+                    if not checkpoint.is_done("liked"):
+                        with self.metrics.stage("liked", label="Liked Songs"):
+                            self.metrics.progress("Procesando: Liked Songs", current=current_step, total=total_steps)
+                            self._export_pages(writer, checkpoint, "liked", "Liked Songs",
+                                               lambda offset: self.sp.current_user_saved_tracks(limit=50, offset=offset))
+
+                export_stage.add("bytes", checkpoint.size)
+                checkpoint.commit()
+        finally:
+            checkpoint.close()
+            unsubscribe()
+
+    def _export_pages(self, writer, checkpoint, key, playlist_name, fetch_page):
+        """Paginar una fuente por offset, guardando checkpoint tras cada pagina."""
+        offset = checkpoint.start_offset(key)
+        while True:
+            self.metrics.count("api_calls")
+            results = fetch_page(offset)
+            written = self._write_items(writer, results['items'], playlist_name)
+            if not results['next']:
+                checkpoint.source_done(key, written)
+                return
+            offset = results['offset'] + results['limit']
+            checkpoint.page_done(key, offset, written)
 
-        with open(filename, mode, newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Track Name", "Artist Name", "Album Name", "Playlist", "URI"])
-
-            for pl in playlists_to_export:
-                current_step += 1
-                if callback: callback(current_step, total_steps, f"Procesando: {pl['name']}")
-                
-                pl_tracks = self.get_playlist_tracks(pl['id'])
-                for item in pl_tracks:
-                    track_data = item.get('track')
-                    if not track_data: continue
-                    self._write_track(writer, track_data, pl['name'])
-
-            if include_liked:
-                current_step += 1
-                if callback: callback(current_step, total_steps, "Procesando: Liked Songs")
-                liked = self.get_liked_songs()
-                for item in liked:
-                    track_data = item.get('track')
-                    if not track_data: continue
-                    self._write_track(writer, track_data, "Liked Songs")
+    def _write_items(self, writer, items, playlist_name):
+        written = 0
+        for item in items:
+            track_data = item.get('track')
+            if not track_data: continue
+            self._write_track(writer, track_data, playlist_name)
+            written += 1
+        self.metrics.count("tracks", written)
+        return written
 
     def _write_track(self, writer, track_data, playlist_name):
         name = track_data['name']
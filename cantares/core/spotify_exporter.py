@@ -5,92 +5,131 @@ import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from dotenv import load_dotenv
 
+from cantares.core.checkpoint import ExportCheckpoint
+from cantares.core.metrics import Metrics, message_renderer
+
 # Load env variables (likely from root .env)
 load_dotenv()
 
 class SpotifyExporter:
-    def __init__(self, update_callback=None):
+    def __init__(self, update_callback=None, metrics=None):
         """
         Initialize Spotify Exporter.
         :param update_callback: Optional function(message) to report progress.
+        :param metrics: Optional Metrics collector (default: Metrics.from_env("export")).
         """
         self.client_id = os.getenv("SPOTIFY_CLIENT_ID")
         self.client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
         self.redirect_uri = "https://nona-xi.vercel.app/callback"
         self.update_callback = update_callback or (lambda msg: print(msg))
+        self.metrics = metrics or Metrics.from_env("export")
+        self.metrics.subscribe(message_renderer(self.update_callback))
 
     def authenticate(self):
         if not self.client_id or not self.client_secret:
             raise ValueError("❌ Missing credentials in .env (SPOTIFY_CLIENT_ID, SPOTIFY_CLIENT_SECRET)")
 
-        scope = "playlist-read-private user-library-read"
-        self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
-            client_id=self.client_id,
-            client_secret=self.client_secret,
-            redirect_uri=self.redirect_uri,
-            scope=scope,
-            open_browser=True
-        ))
-        
-        user = self.sp.current_user()
-        self.update_callback(f"👤 Authenticated as: {user['display_name']}")
+        with self.metrics.stage("auth"):
+            scope = "playlist-read-private user-library-read"
+            self.sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
+                client_id=self.client_id,
+                client_secret=self.client_secret,
+                redirect_uri=self.redirect_uri,
+                scope=scope,
+                open_browser=True
+            ))
+            
+            self.metrics.count("api_calls")
+            user = self.sp.current_user()
+            self.metrics.progress(f"👤 Authenticated as: {user['display_name']}")
         return user
 
     def get_playlists(self):
-        playlists = []
-        results = self.sp.current_user_playlists(limit=50)
-        playlists.extend(results['items'])
-        while results['next']:
-            results = self.sp.next(results)
-            playlists.extend(results['items'])
-        
-        self.update_callback(f"📦 Found {len(playlists)} playlists.")
+        with self.metrics.stage("playlists"):
+            playlists = self._fetch_all(lambda: self.sp.current_user_playlists(limit=50))
+            self.metrics.progress(f"📦 Found {len(playlists)} playlists.")
         return playlists
 
-    def export_to_csv(self, filename="spotify_export.csv"):
+    def export_to_csv(self, filename="spotify_export.csv", resume=True):
+        """
+        Export all playlists + Liked Songs to CSV.
+        Writes to `<filename>.part` with per-page checkpoints; an interrupted
+        export resumes where it stopped and the final file is renamed atomically.
+        """
         if not hasattr(self, 'sp'):
             self.authenticate()
 
-        playlists = self.get_playlists()
-        total_tracks = 0
-
-        with open(filename, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["Track Name", "Artist Name", "Album Name", "Playlist", "URI"])
-
-            # 1. Export Playlists
-            for pl in playlists:
-                self.update_callback(f"🎵 Processing playlist: {pl['name']}...")
-                results = self.sp.playlist_items(pl['id'])
-                tracks = results['items']
-                while results['next']:
-                    results = self.sp.next(results)
-                    tracks.extend(results['items'])
-                
-                for item in tracks:
-                    track_data = item.get('track')
-                    if not track_data: continue
-                    
-                    self._write_track(writer, track_data, pl['name'])
-                    total_tracks += 1
-
-            # 2. Export Liked Songs
-            self.update_callback("💖 Processing 'Liked Songs'...")
-            results = self.sp.current_user_saved_tracks(limit=50)
-            tracks = results['items']
-            while results['next']:
-                results = self.sp.next(results)
-                tracks.extend(results['items'])
-            
-            for item in tracks:
-                track_data = item.get('track')
-                if not track_data: continue
-                self._write_track(writer, track_data, "Liked Songs")
-                total_tracks += 1
+        checkpoint = ExportCheckpoint(filename, fingerprint="all+liked")
+        if not (resume and checkpoint.load()):
+            checkpoint.discard()
+
+        with self.metrics.stage("export") as export_stage:
+            playlists = self.get_playlists()
+            if checkpoint.resumed:
+                self.metrics.progress(f"⏯️ Resuming export: {len(checkpoint.done)} playlists "
+                                      f"({checkpoint.tracks} tracks) already saved.")
 
-        self.update_callback(f"✨ Export Complete! {total_tracks} tracks saved to {filename}")
+            writer = csv.writer(checkpoint.open())
+            try:
+                # 1. Export Playlists
+                for pl in playlists:
+                    if checkpoint.is_done(pl['id']):
+                        continue
+                    with self.metrics.stage("playlist", label=pl['name']):
+                        self.metrics.progress(f"🎵 Processing playlist: {pl['name']}...")
+                        self._export_pages(writer, checkpoint, pl['id'], pl['name'],
+                                           lambda offset: self.sp.playlist_items(pl['id'], offset=offset))
+
+                # 2. Export Liked Songs
+                if not checkpoint.is_done("liked"):
+                    with self.metrics.stage("liked", label="Liked Songs"):
+                        self.metrics.progress("💖 Processing 'Liked Songs'...")
+                        self._export_pages(writer, checkpoint, "liked", "Liked Songs",
+                                           lambda offset: self.sp.current_user_saved_tracks(limit=50, offset=offset))
+
+                export_stage.add("bytes", checkpoint.size)
+                checkpoint.commit()
+            finally:
+                checkpoint.close()
+
+            total_tracks = checkpoint.tracks
+            self.metrics.progress(f"✨ Export Complete! {total_tracks} tracks saved to {filename}")
         return total_tracks
 
+    def _export_pages(self, writer, checkpoint, key, playlist_name, fetch_page):
+        """Paginar una fuente por offset, guardando checkpoint tras cada pagina."""
+        offset = checkpoint.start_offset(key)
+        while True:
+            self.metrics.count("api_calls")
+            results = fetch_page(offset)
+            written = self._write_items(writer, results['items'], playlist_name)
+            if not results['next']:
+                checkpoint.source_done(key, written)
+                return
+            offset = results['offset'] + results['limit']
+            checkpoint.page_done(key, offset, written)
+
+    def _fetch_all(self, first_page):
+        """Recorrer el paginado de Spotify contando llamadas a la API."""
+        self.metrics.count("api_calls")
+        results = first_page()
+        items = list(results['items'])
+        while results['next']:
+            self.metrics.count("api_calls")
+            results = self.sp.next(results)
+            items.extend(results['items'])
+        return items
+
+    def _write_items(self, writer, items, playlist_name):
+        written = 0
+        for item in items:
+            track_data = item.get('track')
+            if not track_data: continue
+            self._write_track(writer, track_data, playlist_name)
+            written += 1
+        self.metrics.count("tracks", written)
+        return written
+
     def _write_track(self, writer, track_data, playlist_name):
         name = track_data['name']
         artist = track_data['artists'][0]['name'] if track_data['artists'] else "Unknown"
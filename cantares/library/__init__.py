@@ -0,0 +1,2 @@
+from .catalog import LibraryCatalog, AuditRecord, LOSSLESS_EXTENSIONS
+from .audit import AuditSettings, AuditResult, audit_library, classify
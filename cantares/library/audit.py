@@ -0,0 +1,228 @@
+"""
+audit.py — Auditoría espectral de archivos "lossless" de la librería.
+
+Un FLAC que viene de un MP3/AAC re-codificado conserva el lowpass del
+encoder con pérdida: arriba de ~16-20 kHz solo queda el piso de ruido y
+el espectro cae en picada. Por cada archivo se decodifica una ventana
+corta (por defecto 10 s a la mitad del track) con el ffmpeg de
+`MusicDownloader._find_ffmpeg`, se promedia el espectro con una FFT
+vectorizada en NumPy y se mide dónde cae el espectro y cuánto.
+
+El análisis corre en un pool de procesos y las mediciones se cachean por
+hash de archivo y ventana en el catálogo de la librería. El veredicto se
+decide en cada corrida con `classify`, así que cambiar los umbrales no
+obliga a re-decodificar ni deja veredictos viejos en el cache.
+
+Requiere NumPy (`pip install cantares[audit]`).
+"""
+
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, List, Optional, Tuple
+
+from cantares.core.metrics import Metrics, step_renderer
+from cantares.library.catalog import LibraryCatalog, AuditRecord, LOSSLESS_EXTENSIONS
+
+N_FFT = 4096
+FALLBACK_RATE = 44100
+
+
+@dataclass
+class AuditSettings:
+    """Parámetros del análisis."""
+    window_sec: float = 10.0
+    min_cutoff_hz: float = 21000.0  # Abajo de esto, sospechoso (LAME 320k corta en ~20.5 kHz)
+    min_cliff_db: float = 25.0  # Caída mínima alrededor del corte para llamarlo lowpass
+
+
+def find_ffmpeg_exe() -> Optional[str]:
+    """Ejecutable de ffmpeg según `MusicDownloader._find_ffmpeg` (que retorna la carpeta)."""
+    from cantares.core.music_downloader import MusicDownloader
+    ffmpeg_dir = MusicDownloader._find_ffmpeg()
+    if not ffmpeg_dir:
+        return None
+    for name in ("ffmpeg.exe", "ffmpeg"):
+        candidate = os.path.join(ffmpeg_dir, name)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
+
+
+# ── Análisis (nivel módulo para que el pool lo pueda picklear) ──
+
+def estimate_cutoff(samples, sample_rate: int) -> Tuple[float, float]:
+    """
+    Medir la caída más fuerte del espectro de una señal mono.
+
+    Todos los frames de N_FFT muestras se transforman de una sola vez
+    (rfft sobre una matriz frames x N_FFT) y se promedia la potencia. El
+    corte es el punto con la mayor caída entre la banda de abajo y la de
+    arriba (250-1000 Hz a cada lado), calculada para todos los bins a la
+    vez con sumas acumuladas.
+
+    Returns:
+        (cutoff_hz, cliff_db): frecuencia de la mayor caída y cuántos dB
+        cae el espectro ahí. Si es un lowpass o no lo decide `classify`.
+    """
+    import numpy as np
+
+    n_frames = len(samples) // N_FFT
+    frames = samples[:n_frames * N_FFT].reshape(n_frames, N_FFT) * np.hanning(N_FFT)
+    power = np.mean(np.abs(np.fft.rfft(frames, axis=1)) ** 2, axis=0)
+    power_db = 10 * np.log10(power + 1e-20)
+    freqs = np.fft.rfftfreq(N_FFT, 1.0 / sample_rate)
+
+    bin_hz = freqs[1]
+    near, far = int(250 / bin_hz), int(1000 / bin_hz)
+    csum = np.concatenate(([0.0], np.cumsum(power_db)))
+    idx = np.arange(max(far, int(2000 / bin_hz)), len(power_db) - far)
+    if idx.size == 0:
+        return float(freqs[-1]), 0.0
+    below = (csum[idx - near] - csum[idx - far]) / (far - near)
+    above = (csum[idx + far] - csum[idx + near]) / (far - near)
+    drop = below - above
+
+    best = int(np.argmax(drop))
+    return float(freqs[idx[best]]), float(drop[best])
+
+
+def _probe(path: str) -> Tuple[Optional[int], Optional[float]]:
+    """(sample_rate, duración) desde los headers vía mutagen, si está disponible."""
+    try:
+        import mutagen
+        audio = mutagen.File(path)
+        if audio is not None and audio.info:
+            return getattr(audio.info, "sample_rate", None), getattr(audio.info, "length", None)
+    except Exception:
+        pass
+    return None, None
+
+
+def audit_file(item: Tuple[str, str], ffmpeg: str, settings: AuditSettings) -> AuditRecord:
+    """Decodificar una ventana del archivo y medir su espectro."""
+    path, digest = item
+    try:
+        import numpy as np
+
+        sample_rate, length = _probe(path)
+        start = max(0.0, (length or 0) / 2 - settings.window_sec / 2)
+        cmd = [ffmpeg, "-v", "error", "-nostdin", "-ss", f"{start:.2f}", "-t", str(settings.window_sec),
+               "-i", path, "-map", "0:a:0", "-ac", "1"]
+        if not sample_rate:
+            sample_rate = FALLBACK_RATE
+            cmd += ["-ar", str(FALLBACK_RATE)]
+        cmd += ["-f", "f32le", "-"]
+
+        proc = subprocess.run(cmd, capture_output=True, timeout=120)
+        if proc.returncode != 0:
+            raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip()[:200] or "ffmpeg failed")
+
+        samples = np.frombuffer(proc.stdout, dtype=np.float32)
+        if samples.size < N_FFT or float(np.max(np.abs(samples))) < 1e-4:
+            return AuditRecord(digest, settings.window_sec, "silent", sample_rate=sample_rate)
+
+        cutoff, cliff = estimate_cutoff(samples, sample_rate)
+        return AuditRecord(digest, settings.window_sec, "measured",
+                           cutoff_hz=round(cutoff, 1), cliff_db=round(cliff, 1), sample_rate=sample_rate)
+    except Exception as e:
+        return AuditRecord(digest, settings.window_sec, "error", error=str(e)[:200])
+
+
+def classify(record: AuditRecord, settings: AuditSettings) -> Tuple[str, Optional[float]]:
+    """
+    Veredicto para una medición con los umbrales actuales.
+
+    Returns:
+        (status, cutoff_hz): status es 'ok', 'suspect', 'silent' o 'error'.
+        Si la caída no llega a `min_cliff_db` el contenido llega hasta
+        arriba y el corte reportado es Nyquist.
+    """
+    if record.status != "measured":
+        return record.status, None
+    if record.cliff_db < settings.min_cliff_db:
+        return "ok", (record.sample_rate or FALLBACK_RATE) / 2
+    return ("suspect" if record.cutoff_hz < settings.min_cutoff_hz else "ok"), record.cutoff_hz
+
+
+# ── Orquestación ─────────────────────────────────────────
+
+@dataclass
+class AuditResult:
+    """Un archivo auditado (o leído del cache), ya clasificado."""
+    path: str
+    record: AuditRecord
+    status: str
+    cutoff_hz: Optional[float] = None
+    cached: bool = False
+
+    @property
+    def suspect(self) -> bool:
+        return self.status == "suspect"
+
+
+def audit_library(library_dir: str = "Downloads", workers: Optional[int] = None,
+                  settings: Optional[AuditSettings] = None, force: bool = False,
+                  extensions=LOSSLESS_EXTENSIONS, metrics: Optional[Metrics] = None,
+                  callback: Optional[Callable[[int, int, str], None]] = None) -> List[AuditResult]:
+    """
+    Auditar los archivos lossless de la librería.
+
+    Args:
+        library_dir: Carpeta de la librería.
+        workers: Procesos del pool (default: núcleos de la CPU).
+        settings: Umbrales del análisis.
+        force: Ignorar el cache y re-analizar todo.
+        callback: function(current, total, message) de progreso.
+
+    Returns:
+        Lista de AuditResult ordenada por path.
+    """
+    import numpy  # noqa: F401 — fallar temprano si falta NumPy
+
+    settings = settings or AuditSettings()
+    metrics = metrics or Metrics.from_env("library")
+    ffmpeg = find_ffmpeg_exe()
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg no encontrado (bin/, imageio-ffmpeg o PATH)")
+
+    catalog = LibraryCatalog(library_dir)
+    unsubscribe = metrics.subscribe(step_renderer(callback)) if callback else (lambda: None)
+    try:
+        return _run_audit(catalog, ffmpeg, workers, settings, force, extensions, metrics)
+    finally:
+        unsubscribe()
+
+
+def _run_audit(catalog: LibraryCatalog, ffmpeg: str, workers: Optional[int], settings: AuditSettings,
+               force: bool, extensions, metrics: Metrics) -> List[AuditResult]:
+    with metrics.stage("audit") as audit_stage:
+        with metrics.stage("library_scan") as scan_stage:
+            files, rehashed = catalog.scan(extensions)
+            scan_stage.add("files", len(files))
+            scan_stage.add("hashed", rehashed)
+
+        cached = {} if force else catalog.get_audits((h for _, h in files), settings.window_sec)
+        pending = [(p, h) for p, h in files if h not in cached]
+        audit_stage.add("cache_hits", len(files) - len(pending))
+
+        results = [AuditResult(p, cached[h], *classify(cached[h], settings), cached=True)
+                   for p, h in files if h in cached]
+        fresh = []
+        if pending:
+            work = partial(audit_file, ffmpeg=ffmpeg, settings=settings)
+            with metrics.stage("spectral"), ProcessPoolExecutor(max_workers=workers) as pool:
+                for i, ((path, _), record) in enumerate(zip(pending, pool.map(work, pending))):
+                    fresh.append(record)
+                    result = AuditResult(path, record, *classify(record, settings))
+                    results.append(result)
+                    metrics.count("decoded_sec", settings.window_sec if record.status != "error" else 0)
+                    metrics.progress(f"{result.status.upper()}: {os.path.basename(path)}",
+                                     current=i + 1, total=len(pending))
+            catalog.store_audits(r for r in fresh if r.status != "error")
+
+        audit_stage.add("suspects", sum(1 for r in results if r.suspect))
+
+    return sorted(results, key=lambda r: r.path)
@@ -0,0 +1,141 @@
+"""
+catalog.py — Catálogo SQLite de la librería de música descargada.
+
+Guarda por archivo (path, mtime, size, hash) y las mediciones de auditoría
+indexadas por hash y ventana de análisis, para que renombrar o mover un
+archivo no obligue a re-analizarlo y un archivo sin cambios nunca se vuelva
+a decodificar. Solo se cachean mediciones: el veredicto (ok/sospechoso) se
+decide al leerlas, con los umbrales de esa corrida.
+"""
+
+import os
+import sqlite3
+import hashlib
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+LOSSLESS_EXTENSIONS = (".flac", ".wav", ".aiff", ".aif")
+
+_HASH_CHUNK = 1024 * 1024  # 1 MiB del inicio + 1 MiB del final
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    hash TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS audits (
+    hash TEXT NOT NULL,
+    window_sec REAL NOT NULL,
+    status TEXT NOT NULL,
+    cutoff_hz REAL,
+    cliff_db REAL,
+    sample_rate INTEGER,
+    error TEXT,
+    PRIMARY KEY (hash, window_sec)
+);
+"""
+
+
+@dataclass
+class AuditRecord:
+    """Mediciones del análisis espectral de un archivo (sin umbrales aplicados)."""
+    hash: str
+    window_sec: float
+    status: str  # 'measured', 'silent' o 'error'
+    cutoff_hz: Optional[float] = None  # Donde el espectro cae más
+    cliff_db: Optional[float] = None  # Cuántos dB cae ahí
+    sample_rate: Optional[int] = None
+    error: Optional[str] = None
+
+
+def file_hash(path: str) -> str:
+    """Hash rápido: tamaño + primer y último MiB (no lee el archivo entero)."""
+    size = os.path.getsize(path)
+    h = hashlib.blake2b(str(size).encode(), digest_size=16)
+    with open(path, "rb") as f:
+        h.update(f.read(_HASH_CHUNK))
+        if size > 2 * _HASH_CHUNK:
+            f.seek(-_HASH_CHUNK, os.SEEK_END)
+            h.update(f.read(_HASH_CHUNK))
+    return h.hexdigest()
+
+
+class LibraryCatalog:
+    """Catálogo incremental de la librería (por defecto `Downloads/`)."""
+
+    def __init__(self, library_dir: str = "Downloads", db_path: Optional[str] = None):
+        self.library_dir = library_dir
+        self.db_path = db_path or os.path.join(library_dir, ".library.sqlite3")
+        os.makedirs(library_dir, exist_ok=True)
+        with self._connect() as db:
+            columns = {row[1] for row in db.execute("PRAGMA table_info(audits)")}
+            if columns and "window_sec" not in columns:
+                # Cache viejo con veredictos en vez de mediciones: descartarlo
+                db.execute("DROP TABLE audits")
+            db.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    def scan(self, extensions: Iterable[str] = LOSSLESS_EXTENSIONS) -> Tuple[List[Tuple[str, str]], int]:
+        """
+        Sincronizar la tabla de archivos con el disco.
+
+        Solo se re-hashean los archivos cuyo mtime/size cambió.
+        Retorna ([(path, hash), ...], cuántos se re-hashearon).
+        """
+        extensions = tuple(e.lower() for e in extensions)
+        on_disk = {}
+        for root, _, names in os.walk(self.library_dir):
+            for name in names:
+                if name.lower().endswith(extensions):
+                    path = os.path.abspath(os.path.join(root, name))
+                    st = os.stat(path)
+                    on_disk[path] = (st.st_mtime, st.st_size)
+
+        with self._connect() as db:
+            known = {p: (m, s, h) for p, m, s, h in db.execute("SELECT path, mtime, size, hash FROM files")}
+
+        rows, rehashed = [], []
+        for path, (mtime, size) in on_disk.items():
+            cached = known.get(path)
+            if cached and cached[:2] == (mtime, size):
+                rows.append((path, cached[2]))
+            else:
+                digest = file_hash(path)
+                rows.append((path, digest))
+                rehashed.append((path, mtime, size, digest))
+
+        with self._connect() as db:
+            db.executemany("INSERT OR REPLACE INTO files (path, mtime, size, hash) VALUES (?, ?, ?, ?)",
+                           rehashed)
+            # Solo olvidar archivos de las extensiones escaneadas que ya no existen
+            db.executemany("DELETE FROM files WHERE path = ?",
+                           [(p,) for p in known if p not in on_disk and p.lower().endswith(extensions)])
+        return sorted(rows), len(rehashed)
+
+    def get_audits(self, hashes: Iterable[str], window_sec: float) -> Dict[str, AuditRecord]:
+        """Mediciones ya cacheadas para esos hashes con esa ventana de análisis."""
+        wanted = set(hashes)
+        with self._connect() as db:
+            rows = db.execute("SELECT hash, window_sec, status, cutoff_hz, cliff_db, sample_rate, error "
+                              "FROM audits WHERE window_sec = ?", (float(window_sec),))
+            return {r[0]: AuditRecord(*r) for r in rows if r[0] in wanted}
+
+    def store_audits(self, records: Iterable[AuditRecord]):
+        with self._connect() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO audits (hash, window_sec, status, cutoff_hz, cliff_db, sample_rate, error) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(r.hash, float(r.window_sec), r.status, r.cutoff_hz, r.cliff_db, r.sample_rate, r.error)
+                 for r in records]
+            )
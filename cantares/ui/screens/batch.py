@@ -6,8 +6,8 @@ from textual.containers import Container, Vertical, Horizontal, Center
 from textual.binding import Binding
 from cantares.core.spotify_exporter import SpotifyExporter
 from cantares.core.batch_downloader import BatchDownloader
+from cantares.core.music_downloader import csv_playlists
 import os
-import csv
 import threading
 
 class BatchScreen(Screen):
@@ -183,15 +183,11 @@ class BatchScreen(Screen):
             self.notify("spotify_export.csv not found. Run export first!", severity="warning")
             return
 
-        playlists = set()
         try:
-            with open("spotify_export.csv", "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    playlists.add(row['Playlist'])
+            playlists = csv_playlists("spotify_export.csv")
             
             selector.clear_options()
-            options = [(p, p) for p in sorted(playlists)]
+            options = [(p, p) for p in playlists]
             selector.add_options(options)
             self.notify(f"Loaded {len(options)} playlists")
             
@@ -2,12 +2,17 @@ from textual.app import ComposeResult
 from textual.containers import Container, Vertical, Horizontal
 from textual.screen import Screen
 from textual.widgets import Header, Footer, Input, Button, Label, DataTable, ProgressBar
+from textual.widgets.data_table import RowDoesNotExist
 from textual import on, work
 from textual.reactive import reactive
+from rich.markup import escape
 
 from cantares.books.annas_archive import AnnasArchiveSearcher
 from cantares.books.downloader import BookDownloader
+from cantares.books.catalog import BookCatalog
+from cantares.books.fulltext import FullTextIndex
 import asyncio
+import os
 
 class BooksScreen(Screen):
     """Screen for searching and downloading books."""
@@ -24,8 +29,11 @@ class BooksScreen(Screen):
                 with Horizontal():
                     yield Input(placeholder="Title, Author, or ISBN...", id="search-input")
                     yield Button("Search", id="search-btn", variant="primary")
+                    yield Button("My Shelf", id="shelf-btn", variant="success")
+                    yield Button("Search Inside", id="fulltext-btn", variant="warning")
             
             yield DataTable(id="results-table", cursor_type="row")
+            yield Label("", id="snippet-label")
             
             with Vertical(id="download-status", classes="hidden"):
                 yield Label("Waiting...", id="status-label")
@@ -34,6 +42,7 @@ class BooksScreen(Screen):
             yield Footer()
 
     def on_mount(self) -> None:
+        self.snippets = {}
         table = self.query_one(DataTable)
         table.add_columns("Title", "Author", "Year", "Ext", "Link")
         # Hide the Link column if possible, or keep it last
@@ -48,6 +57,18 @@ class BooksScreen(Screen):
             
         self.search_books(query)
 
+    @on(Button.Pressed, "#shelf-btn")
+    def on_shelf(self):
+        self.search_shelf(self.query_one("#search-input").value)
+
+    @on(Button.Pressed, "#fulltext-btn")
+    def on_fulltext(self):
+        query = self.query_one("#search-input").value
+        if not query:
+            self.notify("Please enter a search term.")
+            return
+        self.search_fulltext(query)
+
     @on(Input.Submitted, "#search-input")
     def on_input_submit(self):
         self.on_search()
@@ -55,7 +76,9 @@ class BooksScreen(Screen):
     @work(exclusive=True, thread=True)
     def search_books(self, query: str):
         table = self.query_one(DataTable)
+        self.snippets = {}
         self.app.call_from_thread(table.clear)
+        self.app.call_from_thread(self.query_one("#snippet-label", Label).update, "")
         self.notify(f"Searching for '{query}'...")
         
         searcher = AnnasArchiveSearcher()
@@ -78,6 +101,57 @@ class BooksScreen(Screen):
         self.app.call_from_thread(table.add_rows, rows)
         self.notify(f"Found {len(results)} books.")
 
+    @work(exclusive=True, thread=True)
+    def search_shelf(self, query: str):
+        table = self.query_one(DataTable)
+        self.snippets = {}
+        self.app.call_from_thread(table.clear)
+        self.app.call_from_thread(self.query_one("#snippet-label", Label).update, "")
+
+        catalog = BookCatalog()
+        catalog.refresh()
+        results = catalog.search(query)
+
+        if not results:
+            self.app.call_from_thread(self.notify, "No books on your shelf match that.")
+            return
+
+        rows = [(r['title'], r['author'], r['year'], r['extension'], r['link']) for r in results]
+        self.app.call_from_thread(table.add_rows, rows)
+        self.app.call_from_thread(self.notify, f"{len(results)} books on your shelf.")
+
+    @work(exclusive=True, thread=True)
+    def search_fulltext(self, query: str):
+        table = self.query_one(DataTable)
+        self.snippets = {}
+        self.app.call_from_thread(table.clear)
+        self.app.call_from_thread(self.query_one("#snippet-label", Label).update, "")
+        self.app.call_from_thread(self.notify, f"Searching inside your books for '{query}'...")
+
+        index = FullTextIndex()
+        index.refresh()
+        results = index.search(query)
+
+        if not results:
+            self.app.call_from_thread(self.notify, "Nothing inside your books matches that.")
+            return
+
+        # Snippets are raw book text: escape it so brackets aren't parsed as markup
+        self.snippets = {r['link']: escape(r['snippet']) for r in results}
+        rows = [(r['title'], r['author'], r['year'], r['extension'], r['link']) for r in results]
+        self.app.call_from_thread(table.add_rows, rows)
+        self.app.call_from_thread(self.notify, f"Found in {len(results)} books.")
+
+    @on(DataTable.RowHighlighted)
+    def on_row_highlighted(self, event: DataTable.RowHighlighted):
+        # The event can arrive after a search worker already cleared the table
+        try:
+            link = self.query_one(DataTable).get_row(event.row_key)[4]
+        except RowDoesNotExist:
+            return
+        snippet = self.snippets.get(link, "")
+        self.query_one("#snippet-label", Label).update(f"…{snippet}…" if snippet else "")
+
     @on(DataTable.RowSelected)
     def on_row_selected(self, event: DataTable.RowSelected):
         # Get the row data
@@ -86,6 +160,10 @@ class BooksScreen(Screen):
         link = row[4]
         ext = row[3]
         
+        if os.path.isfile(link):
+            self.notify(f"Already on your shelf: {link}")
+            return
+
         self.download_book(title, link, ext)
 
     @work(exclusive=True, thread=True)
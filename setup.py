@@ -33,6 +33,11 @@ setup(
         "lxml",
         "pycryptodome",
     ],
+    extras_require={
+        "books": ["pypdf"],
+        "audit": ["numpy"],
+        "bench": ["pytest", "pytest-benchmark"],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 3.10",